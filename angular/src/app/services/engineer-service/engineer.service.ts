@@ -38,7 +38,7 @@ export class EngineerService {
   ): Observable<any> {
     return this.http
       .get<any>(
-        `${this.url}/engineers/?page=${page}&limit=${limit}&country=${country}&roleType=${selectedRoleType}&roleLevel=${selectedRoleLevel}`
+        `${this.url}/engineers/?page=${page}&limit=${limit}&country=${encodeURIComponent(country)}&roleType=${selectedRoleType}&roleLevel=${selectedRoleLevel}`
       )
       .pipe(
         tap((response) => console.log('Fetched engineers with filters:', response)),
@@ -0,0 +1,42 @@
+# backend/health.py
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from mongoengine.connection import get_db
+
+from users.mail import mail_dispatcher, QUEUED_EMAIL_BACKEND
+from .mongo import pool_monitor
+
+
+@require_GET
+def healthz(request):
+    """
+    Liveness: the process answers requests. Touches no backing service.
+    """
+    return JsonResponse({'status': 'ok'})
+
+
+@require_GET
+def readyz(request):
+    """
+    Readiness: MongoDB answers a ping and this worker's pool has a free connection.
+    Also reports the mail queue when mail is queued; a backlog does not fail readiness.
+    """
+    pool = pool_monitor.snapshot()
+    checks = {'pool': pool}
+    ready = True
+    try:
+        get_db().command('ping')
+        checks['mongo'] = 'ok'
+    except Exception as e:
+        checks['mongo'] = f'error: {e}'
+        ready = False
+    exhausted = [address for address, counters in pool['servers'].items()
+                 if counters['checked_out'] >= pool['max_pool_size'] * pool['clients']]
+    if exhausted:
+        checks['pool_exhausted'] = exhausted
+        ready = False
+    if settings.EMAIL_BACKEND == QUEUED_EMAIL_BACKEND:
+        checks['mail'] = mail_dispatcher.metrics()
+    return JsonResponse({'status': 'ok' if ready else 'unavailable', 'checks': checks},
+                        status=200 if ready else 503)
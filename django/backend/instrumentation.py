@@ -0,0 +1,68 @@
+# backend/instrumentation.py
+import contextlib
+import contextvars
+import time
+
+from rest_framework import serializers
+
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """
+    Named durations (ms) accumulated while handling one request.
+    """
+
+    def __init__(self):
+        self.durations = {}
+
+    def add(self, name, duration_ms):
+        self.durations[name] = self.durations.get(name, 0.0) + duration_ms
+
+
+@contextlib.contextmanager
+def collect_timings():
+    """
+    Collect timed() sections run by this thread or task inside the block.
+    """
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+@contextlib.contextmanager
+def timed(name):
+    """
+    Add the block's duration to the current request's `name` timing, if any.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - started) * 1000)
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Count the time spent building `.data` as the request's serialize timing.
+    Set Meta.list_serializer_class = TimedListSerializer to cover many=True.
+    """
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
@@ -0,0 +1,117 @@
+# backend/middleware.py
+import asyncio
+import cProfile
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+from .instrumentation import collect_timings
+from .mongo import record_mongo_commands
+
+logger = logging.getLogger('backend.requests')
+
+# cProfile cannot run two profilers at once; slow-request sampling takes turns
+_profile_lock = threading.Lock()
+
+
+def _profile_path(request, duration_ms):
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+    name = f'{time.strftime("%Y%m%d-%H%M%S")}-{request.method}-{slug[:80]}-{duration_ms:.0f}ms.prof'
+    return os.path.join(settings.REQUEST_PROFILE_DIR, name)
+
+
+def _record(request, response, duration_ms, mongo, timings, profiler=None):
+    """
+    Add the Server-Timing header, log one JSON line and keep the profile of a slow request.
+    """
+    durations = timings.durations
+    if settings.SERVER_TIMING_HEADER:
+        entries = [f'app;dur={duration_ms:.1f}',
+                   f'db;dur={mongo.duration_ms:.1f};desc="{mongo.count} commands"']
+        entries += [f'{name};dur={value:.1f}' for name, value in sorted(durations.items())]
+        response['Server-Timing'] = ', '.join(entries)
+
+    match = request.resolver_match
+    line = {
+        'method': request.method,
+        'path': request.path,
+        'route': match.route if match else None,
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 2),
+        'db_commands': mongo.count,
+        'db_ms': round(mongo.duration_ms, 2),
+        'db_by_command': mongo.by_command,
+        'response_bytes': None if response.streaming else len(response.content),
+    }
+    line.update({f'{name}_ms': round(value, 2) for name, value in durations.items()})
+
+    slow = settings.SLOW_REQUEST_MS is not None and duration_ms >= settings.SLOW_REQUEST_MS
+    if profiler is not None and slow:
+        path = _profile_path(request, duration_ms)
+        os.makedirs(settings.REQUEST_PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(path)
+        line['profile'] = path
+    logger.log(logging.WARNING if slow else logging.INFO, json.dumps(line))
+
+
+def _start_profiler():
+    """
+    A running profiler for a sampled request, or None (not sampled, or another request holds it).
+    """
+    if (settings.SLOW_REQUEST_MS is None or not settings.REQUEST_PROFILE_SAMPLE_RATE
+            or random.random() >= settings.REQUEST_PROFILE_SAMPLE_RATE):
+        return None
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiling tool is active
+        _profile_lock.release()
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler):
+    profiler.disable()
+    _profile_lock.release()
+
+
+@sync_and_async_middleware
+def request_instrumentation_middleware(get_response):
+    """
+    Per request: wall time, MongoDB command count and time, serialize/render
+    time and response size, as a Server-Timing header and a JSON log line on
+    the `backend.requests` logger. Requests slower than SLOW_REQUEST_MS log at
+    WARNING; a REQUEST_PROFILE_SAMPLE_RATE share of sync requests is profiled
+    and the cProfile output of the slow ones is kept in REQUEST_PROFILE_DIR.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            # Not profiled: on the event loop a profile would mix in every other task
+            with record_mongo_commands() as mongo, collect_timings() as timings:
+                started = time.perf_counter()
+                response = await get_response(request)
+                duration_ms = (time.perf_counter() - started) * 1000
+            _record(request, response, duration_ms, mongo, timings)
+            return response
+    else:
+        def middleware(request):
+            with record_mongo_commands() as mongo, collect_timings() as timings:
+                profiler = _start_profiler()
+                started = time.perf_counter()
+                try:
+                    response = get_response(request)
+                finally:
+                    duration_ms = (time.perf_counter() - started) * 1000
+                    if profiler is not None:
+                        _stop_profiler(profiler)
+            _record(request, response, duration_ms, mongo, timings, profiler)
+            return response
+    return middleware
@@ -0,0 +1,203 @@
+# backend/mongo.py
+import asyncio
+import contextlib
+import contextvars
+import threading
+import weakref
+
+from django.conf import settings
+from mongoengine import connect, disconnect
+from mongoengine.connection import get_db
+from pymongo import ReadPreference, monitoring
+
+# One motor client per event loop: a client is bound to the loop it was first
+# used on. Under ASGI that is a single client per process.
+_async_clients = weakref.WeakKeyDictionary()
+# Host of the registered mongoengine connection, which motor clients follow
+_host = None
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters for the readiness probe, kept per server address.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._servers = {}
+
+    def _add(self, event, counter, delta=1):
+        with self._lock:
+            server = self._servers.setdefault(
+                '%s:%s' % event.address, {'open': 0, 'checked_out': 0, 'checkout_failures': 0, 'cleared': 0}
+            )
+            server[counter] += delta
+
+    def connection_created(self, event):
+        self._add(event, 'open')
+
+    def connection_closed(self, event):
+        self._add(event, 'open', -1)
+
+    def connection_checked_out(self, event):
+        self._add(event, 'checked_out')
+
+    def connection_checked_in(self, event):
+        self._add(event, 'checked_out', -1)
+
+    def connection_check_out_failed(self, event):
+        self._add(event, 'checkout_failures')
+
+    def pool_cleared(self, event):
+        self._add(event, 'cleared')
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def snapshot(self):
+        """
+        {'max_pool_size', 'clients', 'servers': {address: counters}}. Counters
+        add up every client in this process (mongoengine plus one motor client
+        per event loop), each of which has its own pool per server.
+        """
+        with self._lock:
+            servers = {address: dict(counters) for address, counters in self._servers.items()}
+        return {'max_pool_size': settings.MONGO_MAX_POOL_SIZE, 'clients': 1 + len(_async_clients),
+                'servers': servers}
+
+
+pool_monitor = PoolMonitor()
+
+
+class CommandStats:
+    """
+    MongoDB commands seen inside one record_mongo_commands() block.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.by_command = {}
+
+    def add(self, command_name, duration_micros):
+        self.count += 1
+        self.duration_ms += duration_micros / 1000
+        self.by_command[command_name] = self.by_command.get(command_name, 0) + 1
+
+
+_command_stats = contextvars.ContextVar('mongo_command_stats', default=None)
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Attributes every finished command to the CommandStats active in the context
+    that issued it. pymongo reports from the calling thread, and motor carries
+    the caller's context into its executor, so concurrent requests stay apart.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        stats = _command_stats.get()
+        if stats is not None:
+            stats.add(event.command_name, event.duration_micros)
+
+
+command_monitor = CommandMonitor()
+
+
+@contextlib.contextmanager
+def record_mongo_commands():
+    """
+    Count the MongoDB commands issued by this thread or task inside the block.
+    """
+    stats = CommandStats()
+    token = _command_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _command_stats.reset(token)
+
+
+def client_options():
+    """
+    Pool and timeout options shared by the mongoengine and motor clients.
+    """
+    return {
+        'maxPoolSize': settings.MONGO_MAX_POOL_SIZE,
+        'minPoolSize': settings.MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': settings.MONGO_MAX_IDLE_TIME_MS,
+        'waitQueueTimeoutMS': settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        'connectTimeoutMS': settings.MONGO_CONNECT_TIMEOUT_MS,
+        'serverSelectionTimeoutMS': settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'event_listeners': [pool_monitor, command_monitor],
+    }
+
+
+def connect_mongo(host=None, **options):
+    """
+    Register mongoengine's default connection. pymongo only opens sockets on
+    first use, so calling this before a fork leaves nothing to share.
+    """
+    global _host
+    _host = host or settings.MONGO_URI
+    _async_clients.clear()
+    connect(host=_host, connect=False, **{**client_options(), **options})
+
+
+def reconnect_mongo():
+    """
+    Drop clients inherited from the parent process and register fresh ones;
+    run in every worker after fork.
+    """
+    disconnect()
+    pool_monitor.reset()
+    connect_mongo()
+
+
+def list_read_preference():
+    """
+    Read preference for the list and count endpoints, which tolerate replica lag.
+    """
+    return getattr(ReadPreference, settings.MONGO_LIST_READ_PREFERENCE)
+
+
+def get_async_db():
+    """
+    The mongoengine database, reached through motor for use in async views.
+
+    Must be called from a running event loop. The database name comes from
+    mongoengine's connection so both drivers always see the same data.
+    """
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        # Same UUID encoding as mongoengine, so UUID ids match on both paths
+        client = AsyncIOMotorClient(_host or settings.MONGO_URI, uuidRepresentation='pythonLegacy', **client_options())
+        _async_clients[loop] = client
+    return client[get_db().name]
@@ -0,0 +1,87 @@
+# backend/prefetch.py
+#
+# select_related for mongoengine documents: reading a ReferenceField fetches
+# the referenced document on first access, one query per document. These
+# helpers collect the referenced ids of a whole batch up front, load them with
+# a single $in query per field and put them back, so later reads never hit
+# MongoDB.
+
+from bson import DBRef
+from mongoengine.fields import ReferenceField
+
+
+def _pending(documents, field):
+    """
+    (document_type, ids) still to load for `field`, skipping references already dereferenced.
+    """
+    documents = [document for document in documents if document is not None]
+    if not documents:
+        return None, []
+    reference = documents[0]._fields.get(field)
+    if not isinstance(reference, ReferenceField):
+        raise ValueError(f'{type(documents[0]).__name__}.{field} is not a ReferenceField')
+    ids = {document._data[field].id for document in documents if isinstance(document._data.get(field), DBRef)}
+    return reference.document_type, list(ids)
+
+
+def _wire(documents, field, loaded):
+    # Straight into _data: assigning the attribute would mark the field as changed
+    for document in documents:
+        value = document._data.get(field) if document is not None else None
+        if isinstance(value, DBRef) and value.id in loaded:
+            document._data[field] = loaded[value.id]
+
+
+def _from_cache(ids, cache):
+    loaded = {}
+    if cache is not None:
+        for referenced_id in ids:
+            referenced = cache.get(referenced_id)
+            if referenced is not None:
+                loaded[referenced_id] = referenced
+    return loaded
+
+
+def prefetch_references(documents, *fields, cache=None):
+    """
+    Resolve the `fields` references of every document in `documents` with one
+    query per field, and return the documents as a list.
+
+    `cache` is an optional get(id)/set(id, document) store (users.cache.user_cache
+    for User references) consulted before querying and filled from the query.
+    References to documents that no longer exist are left unresolved.
+    """
+    documents = list(documents)
+    for field in fields:
+        document_type, ids = _pending(documents, field)
+        loaded = _from_cache(ids, cache)
+        missing = [referenced_id for referenced_id in ids if referenced_id not in loaded]
+        if missing:
+            for referenced in document_type.objects(pk__in=missing):
+                loaded[referenced.pk] = referenced
+                if cache is not None:
+                    cache.set(referenced.pk, referenced)
+        _wire(documents, field, loaded)
+    return documents
+
+
+async def aprefetch_references(documents, *fields, cache=None):
+    """
+    prefetch_references() for async views: the $in queries go through motor.
+    """
+    from .mongo import get_async_db
+
+    documents = list(documents)
+    for field in fields:
+        document_type, ids = _pending(documents, field)
+        loaded = _from_cache(ids, cache)
+        missing = [referenced_id for referenced_id in ids if referenced_id not in loaded]
+        if missing:
+            collection = get_async_db()[document_type._get_collection_name()]
+            async for son in collection.find({'_id': {'$in': missing}}):
+                referenced = document_type._from_son(son)
+                loaded[referenced.pk] = referenced
+                if cache is not None:
+                    cache.set(referenced.pk, referenced)
+        _wire(documents, field, loaded)
+    return documents
@@ -0,0 +1,44 @@
+# backend/renderers.py
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+from .instrumentation import timed
+
+try:
+    import orjson
+except ImportError:  # optional: without it responses use the stdlib encoder
+    orjson = None
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that reports its encoding time as the request's render timing.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    # Types orjson has no native encoding for (Decimal, lazy strings, ...) go through DRF's encoder
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(TimedJSONRenderer):
+    """
+    TimedJSONRenderer encoding with orjson when it is installed. UUIDs and
+    datetimes are encoded natively; the output is compact UTF-8 like
+    JSONRenderer's. Indented output (the browsable API, `; indent=` in Accept)
+    and installs without orjson use JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        with timed('render'):
+            return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,6 +1,5 @@
 from pathlib import Path
 from datetime import timedelta
-from mongoengine import connect
 from dotenv import load_dotenv
 import os
 import environ
@@ -14,7 +13,13 @@ env = environ.Env()
 environ.Env.read_env()
 
 # Email settings
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Mail is queued and sent by a background worker (users/mail.py) through MAIL_QUEUE_BACKEND
+EMAIL_BACKEND = 'users.mail.QueuedEmailBackend'
+MAIL_QUEUE_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+MAIL_QUEUE_MAX_RETRIES = 5
+MAIL_QUEUE_RETRY_BACKOFF = 2  # seconds, doubled after every failed attempt
+MAIL_QUEUE_IDLE_TIMEOUT = 30  # seconds before an idle SMTP connection is closed
+MAIL_CLAIM_TIMEOUT = 600  # seconds after which a message claimed by a live-looking worker is resent
 EMAIL_HOST = 'smtp.mail.yahoo.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -24,12 +29,31 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Pending outgoing mail survives restarts here
+MAIL_SPOOL_DIR = env('MAIL_SPOOL_DIR', default=str(BASE_DIR / 'mail_spool'))
+
 SECRET_KEY = os.getenv('SECRET_KEY')
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
 
-# MongoDB configuration using mongoengine
-if 'test' not in sys.argv:
-    connect(host=os.getenv('MONGO_URI'))
+# MongoDB configuration using mongoengine (sync views) and motor (async views).
+# The connection is registered in UsersConfig.ready() (backend/mongo.py), and
+# again in every gunicorn worker after fork.
+MONGO_URI = os.getenv('MONGO_URI')
+MONGO_AUTO_CONNECT = 'test' not in sys.argv
+# Per-process pool; size it to the worker's threads (or concurrent async requests)
+MONGO_MAX_POOL_SIZE = env.int('MONGO_MAX_POOL_SIZE', default=100)
+MONGO_MIN_POOL_SIZE = env.int('MONGO_MIN_POOL_SIZE', default=0)
+MONGO_MAX_IDLE_TIME_MS = env.int('MONGO_MAX_IDLE_TIME_MS', default=0) or None  # 0: keep idle sockets
+MONGO_WAIT_QUEUE_TIMEOUT_MS = env.int('MONGO_WAIT_QUEUE_TIMEOUT_MS', default=0) or None  # 0: wait for a socket
+MONGO_CONNECT_TIMEOUT_MS = env.int('MONGO_CONNECT_TIMEOUT_MS', default=20000)
+MONGO_SERVER_SELECTION_TIMEOUT_MS = env.int('MONGO_SERVER_SELECTION_TIMEOUT_MS', default=30000)
+# pymongo ReadPreference name for the engineer list/count endpoints, e.g. SECONDARY_PREFERRED
+MONGO_LIST_READ_PREFERENCE = env('MONGO_LIST_READ_PREFERENCE', default='PRIMARY')
+
+# Serve the hot read endpoints (engineer list/detail/me/count, login) from async
+# views on motor. Meant for ASGI (uvicorn backend.asgi:application); under WSGI
+# each async request runs in its own event loop, so keep this off there.
+ASYNC_VIEWS = env.bool('ASYNC_VIEWS', default=False)
 
 DEBUG = True
 
@@ -50,8 +74,25 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson-backed when installed, DRF's stdlib JSON otherwise (backend/renderers.py, backend/parsers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "backend.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "backend.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# Request instrumentation (backend/middleware.py)
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', default=True)
+SLOW_REQUEST_MS = env.int('SLOW_REQUEST_MS', default=500) or None  # logged at WARNING; 0 disables
+# Share of sync requests run under cProfile; profiles of the slow ones are kept
+REQUEST_PROFILE_SAMPLE_RATE = env.float('REQUEST_PROFILE_SAMPLE_RATE', default=0.0)
+REQUEST_PROFILE_DIR = env('REQUEST_PROFILE_DIR', default=str(BASE_DIR / 'profiles'))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -61,12 +102,84 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Process-local cache of authenticated users (see users/cache.py)
+USER_CACHE_MAX_SIZE = 1024
+USER_CACHE_TTL = 60  # seconds; other workers see role changes after at most this long
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Largest page size the engineer list and search endpoints serve; bigger limits are capped
+ENGINEER_PAGE_MAX_LIMIT = 100
+
+# Seconds a filtered engineer count stays cached; writes invalidate it sooner
+ENGINEER_COUNT_CACHE_TIMEOUT = 60
+# Seconds the profile statistics stay cached (and clients may reuse them)
+ENGINEER_STATS_CACHE_TIMEOUT = 30
+# Seconds a serialized profile stays cached. Writes invalidate it, but only in
+# the shared cache: with per-process LocMemCache other workers may lag this long.
+ENGINEER_PROFILE_CACHE_TIMEOUT = 60
+# Most profiles one batch request may ask for (engineers/batch/)
+ENGINEER_BATCH_MAX_IDS = 200
+# Documents fetched per MongoDB round-trip when streaming exports
+ENGINEER_EXPORT_BATCH_SIZE = 500
+
+# In-memory bitmap index answering the engineer list filters (engineers/bitmaps.py).
+# Lists fall back to MongoDB queries while it is building or has not refreshed for MAX_STALENESS seconds.
+ENGINEER_FILTER_INDEX = env.bool('ENGINEER_FILTER_INDEX', default=True)
+ENGINEER_FILTER_INDEX_REFRESH_INTERVAL = 5
+ENGINEER_FILTER_INDEX_MAX_STALENESS = 30
+# Seconds the read models (filter index, match matrix) re-read behind the newest
+# updated_at they have seen; must exceed write latency plus clock skew between workers
+ENGINEER_READ_MODEL_LOOKBACK = 300
+
+# Recruiter match scoring (engineers/matching.py). Skills are words looked up in
+# each profile's search terms; at most 64.
+ENGINEER_MATCH_SKILLS = env.list('ENGINEER_MATCH_SKILLS', default=[
+    'angular', 'typescript', 'javascript', 'rxjs', 'ngrx', 'react', 'vue', 'node', 'nestjs', 'html', 'css',
+    'sass', 'tailwind', 'python', 'django', 'flask', 'fastapi', 'java', 'spring', 'kotlin', 'go', 'rust',
+    'csharp', 'dotnet', 'php', 'ruby', 'rails', 'swift', 'ios', 'android', 'flutter', 'sql', 'postgres',
+    'mysql', 'mongodb', 'redis', 'graphql', 'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform',
+    'linux', 'devops', 'testing', 'jest', 'cypress', 'playwright', 'figma', 'ux', 'ml', 'ai', 'data',
+])
+ENGINEER_MATCH_REFRESH_INTERVAL = 30  # seconds between re-reads of profiles other workers updated
+ENGINEER_MATCH_MAX_RESULTS = 100
+
+# Opt-in: embed role/is_verified in issued tokens so role-gated endpoints skip the user fetch
+JWT_EMBED_USER_CLAIMS = env.bool('JWT_EMBED_USER_CLAIMS', default=False)
+
+# Password hashing (users/hashing.py). Use the full werkzeug method string with its
+# parameters: stored hashes with a different prefix are rehashed on the next login.
+PASSWORD_HASH_METHOD = env('PASSWORD_HASH_METHOD', default='scrypt:32768:8:1')
+PASSWORD_HASH_EXECUTOR = env('PASSWORD_HASH_EXECUTOR', default='thread')  # or 'process'
+PASSWORD_HASH_WORKERS = env.int('PASSWORD_HASH_WORKERS', default=2)
+PASSWORD_HASH_MAX_PENDING = env.int('PASSWORD_HASH_MAX_PENDING', default=8)
+PASSWORD_HASH_WAIT = 0.5  # seconds to wait for a free slot before answering 429
+
 CLOUDINARY_STORAGE = {
     'CLOUD_NAME': os.environ.get('CLOUDINARY_CLOUD_NAME'),
     'API_KEY': os.environ.get('CLOUDINARY_API_KEY'),
     'API_SECRET': os.environ.get('CLOUDINARY_API_SECRET'),
 }
 
+# Avatar uploads (engineers/uploads.py). Uploads always go to a temp file, never memory.
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+AVATAR_STORAGE_BACKEND = env('AVATAR_STORAGE_BACKEND', default='engineers.storage.CloudinaryStorage')
+AVATAR_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+AVATAR_UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024  # Cloudinary's minimum chunk is 5 MB
+AVATAR_UPLOAD_TMP_DIR = None  # system temp dir
+AVATAR_UPLOAD_WORKERS = 2
+AVATAR_UPLOAD_JOB_TTL = 60 * 60
+AVATAR_VARIANT_SIZES = (64, 128, 256, 512)  # square WebP thumbnails; the largest is the avatar
+AVATAR_LIST_VARIANT = 128  # size served on list pages
+AVATAR_WEBP_QUALITY = 80
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -86,6 +199,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its timings cover the rest of the stack
+    'backend.middleware.request_instrumentation_middleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -167,14 +282,30 @@ CSRF_TRUSTED_ORIGINS = [
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': True,
+    'formatters': {
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'loggers': {
+        # One JSON line per request from backend.middleware
+        'backend.requests': {
+            'level': 'INFO',
+        },
+        # pymongo logs every command and heartbeat at DEBUG
+        'pymongo': {
+            'level': 'WARNING',
         },
     },
     'root': {
         'handlers': ['console'],
-        'level': 'DEBUG',
+        'level': env('LOG_LEVEL', default='DEBUG'),
     },
 }
 
@@ -0,0 +1,48 @@
+# backend/settings_production.py
+#
+# Production profile: DJANGO_SETTINGS_MODULE=backend.settings_production,
+# served by `gunicorn -c gunicorn.conf.py` (see gunicorn.conf.py).
+
+from .settings import *
+
+DEBUG = False
+
+SECRET_KEY = env('SECRET_KEY')
+ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=['localhost'])
+SITE_URL = env('SITE_URL', default=SITE_URL)
+CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=CORS_ALLOWED_ORIGINS)
+CSRF_TRUSTED_ORIGINS = env.list('CSRF_TRUSTED_ORIGINS', default=CSRF_TRUSTED_ORIGINS)
+
+# TLS terminates at the proxy in front of gunicorn
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+
+# Upload job status, profile and count invalidation and token-version revocation
+# all live in the Django cache, so every gunicorn worker must share it. Without
+# REDIS_URL the per-process LocMemCache stays, and gunicorn.conf.py refuses to
+# start more than one worker.
+REDIS_URL = env('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': env('CACHE_KEY_PREFIX', default='angulartalents'),
+        }
+    }
+
+# Pool sized for one worker: gunicorn threads (or concurrent async requests) plus
+# the background pools (avatar uploads, mail) that also reach MongoDB
+MONGO_MAX_POOL_SIZE = env.int('MONGO_MAX_POOL_SIZE', default=20)
+MONGO_MIN_POOL_SIZE = env.int('MONGO_MIN_POOL_SIZE', default=2)
+MONGO_MAX_IDLE_TIME_MS = env.int('MONGO_MAX_IDLE_TIME_MS', default=300000)
+MONGO_WAIT_QUEUE_TIMEOUT_MS = env.int('MONGO_WAIT_QUEUE_TIMEOUT_MS', default=2000)
+MONGO_CONNECT_TIMEOUT_MS = env.int('MONGO_CONNECT_TIMEOUT_MS', default=5000)
+MONGO_SERVER_SELECTION_TIMEOUT_MS = env.int('MONGO_SERVER_SELECTION_TIMEOUT_MS', default=5000)
+MONGO_LIST_READ_PREFERENCE = env('MONGO_LIST_READ_PREFERENCE', default='SECONDARY_PREFERRED')
+
+# Timings stay in the logs rather than in responses to the public
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', default=False)
+
+LOGGING['root']['level'] = env('LOG_LEVEL', default='INFO')
@@ -2,6 +2,7 @@
 
 from .settings import *
 from mongoengine import connect, disconnect
+from .mongo import command_monitor
 
 # Notify that test settings are being used
 print("Using test settings with real MongoDB instance")
@@ -17,11 +18,22 @@ connect(
     db='testdb',
     host='localhost',
     port=27017,
-    alias='default'
+    alias='default',
+    event_listeners=[command_monitor],  # lets tests count round-trips with record_mongo_commands()
 )
+MONGO_URI = 'mongodb://localhost:27017/testdb'
+MONGO_AUTO_CONNECT = False  # connected above
 
 # Disable sending real emails
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+MAIL_QUEUE_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+MAIL_QUEUE_RETRY_BACKOFF = 0
+
+# List views query MongoDB directly; the filter index has its own tests
+ENGINEER_FILTER_INDEX = False
+
+# Keep avatar uploads on the local filesystem
+AVATAR_STORAGE_BACKEND = 'engineers.storage.LocalFileStorage'
 
 # Use in-memory SQLite for Django components
 DATABASES = {
@@ -1,11 +1,19 @@
 # project_name/urls.py
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
+from .health import healthz, readyz
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('healthz', healthz, name='healthz'),
+    path('readyz', readyz, name='readyz'),
     path('api/', include('users.urls')), #
     path('api/', include('engineers.urls')), 
 
 ]
+
+# Serves avatars stored by LocalFileStorage during development
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,160 @@
+# engineers/async_views.py
+#
+# Async versions of the engineer read endpoints, routed when ASYNC_VIEWS is on.
+# Reads go through motor; writes (POST/PUT) fall back to the sync DRF views.
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+
+from backend.mongo import get_async_db, list_read_preference
+from backend.prefetch import aprefetch_references
+from users.cache import user_cache
+from users.async_views import async_view, authenticated_user
+from .bitmaps import filter_index
+from .cache import (acached_engineer_count, astore_engineer_count, aget_cached_profile,
+                    aget_cached_profile_for_user, acache_profile)
+from .filters import engineer_filters, filter_query
+from .http import profile_response
+from .models import Engineer
+from .pagination import encode_cursor, decode_cursor, InvalidCursor, page_params, InvalidPage
+from .serializers import EngineerSerializer, EngineerListSerializer, ENGINEER_LIST_FIELDS
+from .views import EngineerListCreateView, EngineerDetailUpdateView, EngineerMeView
+
+
+def _engineers(read_preference=None):
+    collection = get_async_db()[Engineer._get_collection_name()]
+    return collection.with_options(read_preference=read_preference) if read_preference else collection
+
+
+async def _engineer_count(filters, query):
+    """
+    Async get_engineer_count(): (count, is_estimate), sharing its cache.
+    """
+    if not any(filters):
+        return await _engineers(list_read_preference()).estimated_document_count(), True
+
+    count = await acached_engineer_count(filters)
+    if count is None:
+        count = await _engineers(list_read_preference()).count_documents(query)
+        await astore_engineer_count(filters, count)
+    return count, False
+
+
+async def _profile_entry(document, user_id=None):
+    engineer = Engineer._from_son(document)
+    # Resolve the user reference through motor so serializing never blocks the event loop
+    await aprefetch_references([engineer], 'user', cache=user_cache)
+    return await acache_profile(engineer, EngineerSerializer(engineer).data, user_id=user_id)
+
+
+@async_view(['GET'], fallback=EngineerListCreateView.as_view())
+async def engineer_list(request):
+    user, error = await authenticated_user(request, role='engineer')
+    if error:
+        return error
+
+    filters = engineer_filters(request.GET)
+    try:
+        page, limit = page_params(request.GET)
+    except InvalidPage as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    cursor_mode = 'cursor' in request.GET
+    after_id = None
+    if cursor_mode:
+        try:
+            after_id = decode_cursor(request.GET['cursor'])
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    projection = {Engineer._fields[field].db_field: 1 for field in ENGINEER_LIST_FIELDS}
+
+    # Pure in-memory work, so it runs on the event loop like in the sync view
+    if settings.ENGINEER_FILTER_INDEX:
+        indexed = filter_index.query(filters, offset=(page - 1) * limit, limit=limit,
+                                     after_id=after_id, cursor=cursor_mode)
+        if indexed is not None:
+            documents = await _engineers(list_read_preference()).find(
+                {'_id': {'$in': indexed.ids}}, projection).to_list(length=None)
+            by_id = {document['_id']: document for document in documents}
+            page_engineers = [by_id[engineer_id] for engineer_id in indexed.ids if engineer_id in by_id]
+            data = {
+                'engineers': EngineerListSerializer(page_engineers, many=True).data,
+                'total': indexed.total,
+                'total_is_estimate': False
+            }
+            if cursor_mode:
+                data['next_cursor'] = encode_cursor(indexed.ids[-1]) if indexed.has_more else None
+            return JsonResponse(data, status=status.HTTP_200_OK)
+
+    # Same filter document the sync view sends, built by mongoengine without I/O
+    query = filter_query(filters)
+    total_engineers, total_is_estimate = await _engineer_count(filters, query)
+
+    if cursor_mode:
+        if after_id is not None:
+            query = {**query, '_id': {'$gt': after_id}}
+        cursor = _engineers(list_read_preference()).find(query, projection).sort('_id', 1).limit(limit + 1)
+        page_engineers = await cursor.to_list(length=limit + 1)
+        next_cursor = None
+        if len(page_engineers) > limit:
+            page_engineers = page_engineers[:limit]
+            next_cursor = encode_cursor(page_engineers[-1]['_id'])
+
+        return JsonResponse({
+            'engineers': EngineerListSerializer(page_engineers, many=True).data,
+            'total': total_engineers,
+            'total_is_estimate': total_is_estimate,
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
+
+    cursor = _engineers(list_read_preference()).find(query, projection).sort('_id', 1)
+    engineers = await cursor.skip((page - 1) * limit).limit(limit).to_list(length=limit)
+    return JsonResponse({
+        'engineers': EngineerListSerializer(engineers, many=True).data,
+        'total': total_engineers,
+        'total_is_estimate': total_is_estimate
+    }, status=status.HTTP_200_OK)
+
+
+@async_view(['GET'], fallback=EngineerDetailUpdateView.as_view())
+async def engineer_detail(request, engineer_id):
+    user, error = await authenticated_user(request, role='engineer')
+    if error:
+        return error
+
+    entry = await aget_cached_profile(engineer_id)
+    if entry is None:
+        document = await _engineers().find_one({'_id': engineer_id})
+        if document is None:
+            return JsonResponse({'error': 'Engineer not found'}, status=status.HTTP_404_NOT_FOUND)
+        entry = await _profile_entry(document)
+    return profile_response(request, entry, JsonResponse)
+
+
+@async_view(['GET'], fallback=EngineerMeView.as_view())
+async def engineer_me(request):
+    user, error = await authenticated_user(request)
+    if error:
+        return error
+
+    entry = await aget_cached_profile_for_user(user.id)
+    if entry is None:
+        document = await _engineers().find_one({'user': user.id})
+        if document is None:
+            return JsonResponse({'detail': 'Engineer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        entry = await _profile_entry(document, user_id=user.id)
+    return profile_response(request, entry, JsonResponse)
+
+
+@async_view(['GET'])
+async def engineer_count(request):
+    count = await _engineers(list_read_preference()).estimated_document_count()
+    etag = f'"engineer-count-{count}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse({'count': count, 'count_is_estimate': True})
+    response['ETag'] = etag
+    return response
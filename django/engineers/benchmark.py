@@ -0,0 +1,222 @@
+# engineers/benchmark.py
+#
+# Load generator behind `manage.py benchmark`: seeds synthetic users and
+# profiles, then drives the API's hot paths through Django's test client
+# (full middleware, URL routing and views, no network) from a thread pool.
+
+import contextlib
+import datetime
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import Client
+from backend.mongo import record_mongo_commands
+from users.hashing import password_hasher
+from users.models import User
+from users.tokens import tokens_for_user
+from .filters import FILTER_PARAMS
+from .models import Engineer
+from .stats import rebuild_engineer_stats
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+COUNTRIES = ('Germany', 'France', 'Poland', 'Spain', 'Portugal', 'Ukraine', 'Canada', 'Brazil', 'India', 'Kenya')
+CITIES = ('Berlin', 'Paris', 'Warsaw', 'Madrid', 'Lisbon', 'Kyiv', 'Toronto', 'Recife', 'Pune', 'Nairobi')
+WORDS = ('angular', 'django', 'python', 'typescript', 'mongodb', 'react', 'kubernetes', 'aws', 'rxjs', 'graphql',
+         'postgres', 'docker', 'testing', 'frontend', 'backend', 'fullstack', 'design', 'systems', 'mentoring')
+ROLE_TYPES = Engineer._fields['role_type'].field.choices
+ROLE_LEVELS = Engineer._fields['role_level'].field.choices
+
+
+def synthetic_engineer(rng, i, user_id, now):
+    """
+    A realistic, cleaned (search terms filled in) but unsaved profile for user `user_id`.
+    """
+    engineer = Engineer(
+        id=uuid.uuid4(), user=user_id,
+        first_name=f'Bench{i}', last_name=rng.choice(WORDS).title(),
+        tag_line=' '.join(rng.sample(WORDS, 3)),
+        city=rng.choice(CITIES), country=rng.choice(COUNTRIES),
+        bio=' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 80))),
+        search_status='open',
+        role_type=rng.sample(ROLE_TYPES, rng.randint(1, 2)),
+        role_level=[rng.choice(ROLE_LEVELS)],
+        linkedIn=f'https://www.linkedin.com/in/bench-{i}',
+        github=f'https://github.com/bench-{i}',
+        avatar=f'https://cdn.example.com/avatars/bench-{i}.webp',
+        version=0, updated_at=now,
+    )
+    engineer.clean()
+    return engineer
+
+
+def seed(engineers, users, seed=0, batch_size=1000):
+    """
+    Insert `users` engineer-role users, the first `engineers` of them with a
+    profile, straight into their collections. Every user shares one password
+    hash (BENCHMARK_PASSWORD) so seeding does not pay for thousands of hashes.
+
+    Returns (users, engineer_ids); the first len(engineer_ids) users own the profiles.
+    """
+    rng = random.Random(seed)
+    users = max(users, engineers)
+    password_hash = password_hasher.hash(BENCHMARK_PASSWORD)
+    now = datetime.datetime.utcnow()
+
+    seeded, engineer_ids = [], []
+    for start in range(0, users, batch_size):
+        user_batch, engineer_batch = [], []
+        for i in range(start, min(start + batch_size, users)):
+            user = User(id=uuid.uuid4(), email=f'bench-{i}@bench.invalid', password_hash=password_hash,
+                        role='engineer', is_verified=True)
+            user_batch.append(user)
+            if i < engineers:
+                engineer_batch.append(synthetic_engineer(rng, i, user.id, now))
+        User._get_collection().insert_many([user.to_mongo() for user in user_batch], ordered=False)
+        if engineer_batch:
+            Engineer._get_collection().insert_many([e.to_mongo() for e in engineer_batch], ordered=False)
+        seeded.extend(user_batch)
+        engineer_ids.extend(engineer.id for engineer in engineer_batch)
+
+    rebuild_engineer_stats()
+    return seeded, engineer_ids
+
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an ascending list, or None when it is empty.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples, wall_time):
+    """
+    Aggregate (latency_ms, status, mongo CommandStats or None) samples of one endpoint.
+    """
+    latencies = sorted(sample[0] for sample in samples)
+    statuses = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(count for status, count in statuses.items() if int(status) >= 500)
+
+    summary = {
+        'requests': len(samples),
+        'errors': errors,
+        'status_codes': statuses,
+        'throughput_rps': round(len(samples) / wall_time, 2) if wall_time > 0 else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else None,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': latencies[-1] if latencies else None,
+    }
+
+    mongo = [sample[2] for sample in samples if sample[2] is not None]
+    if mongo:
+        by_command = {}
+        for stats in mongo:
+            for name, count in stats.by_command.items():
+                by_command[name] = by_command.get(name, 0) + count
+        total = sum(stats.count for stats in mongo)
+        summary['mongo'] = {
+            'ops_total': total,
+            'ops_per_request': round(total / len(mongo), 3),
+            'time_ms_per_request': round(sum(stats.duration_ms for stats in mongo) / len(mongo), 3),
+            'by_command': by_command,
+        }
+    return summary
+
+
+def filter_combinations():
+    """
+    Every non-empty combination of the list filters, e.g. ('country', 'roleLevel').
+    """
+    return [combo for size in range(1, len(FILTER_PARAMS) + 1)
+            for combo in itertools.combinations(FILTER_PARAMS, size)]
+
+
+class Benchmark:
+    """
+    Drives the scenarios against seeded users. Each scenario is a callable
+    taking (client, rng, user_index) and returning a response.
+    """
+
+    def __init__(self, users, engineer_ids, concurrency=8, requests=200, warmup=10,
+                 page_size=10, seed=0, count_mongo=True):
+        self.engineer_ids = engineer_ids
+        self.concurrency = concurrency
+        self.requests = requests
+        self.warmup = warmup
+        self.page_size = page_size
+        self.seed = seed
+        self.count_mongo = count_mongo
+        # Only users that own a profile can hit the engineer-only endpoints
+        self.engineer_users = users[:len(engineer_ids)]
+        self.tokens = [str(tokens_for_user(user).access_token) for user in self.engineer_users]
+        self._local = threading.local()
+
+    def scenarios(self):
+        deep_page = max(1, len(self.engineer_ids) // self.page_size)
+        scenarios = {
+            'login': self._login,
+            'count': lambda client, rng, i: client.get('/api/engineers/count/'),
+            'list_shallow': self._list({'page': 1}),
+            'list_deep': self._list({'page': deep_page}),
+            'list_cursor': self._list({'cursor': ''}),
+            'detail': lambda client, rng, i: client.get(f'/api/engineers/{rng.choice(self.engineer_ids)}/',
+                                                        **self._auth(i)),
+            'me': lambda client, rng, i: client.get('/api/engineers/me/', **self._auth(i)),
+            'put': self._put,
+        }
+        for combo in filter_combinations():
+            params = {'country': COUNTRIES[0], 'roleType': ROLE_TYPES[0], 'roleLevel': ROLE_LEVELS[0]}
+            scenarios['list_filter_' + '_'.join(combo)] = self._list({param: params[param] for param in combo})
+        return scenarios
+
+    def _auth(self, i):
+        return {'HTTP_AUTHORIZATION': f'Bearer {self.tokens[i]}'}
+
+    def _list(self, params):
+        def request(client, rng, i):
+            return client.get('/api/engineers/', {'limit': self.page_size, **params}, **self._auth(i))
+        return request
+
+    def _login(self, client, rng, i):
+        return client.post('/api/login/', {'email': self.engineer_users[i].email, 'password': BENCHMARK_PASSWORD},
+                           content_type='application/json')
+
+    def _put(self, client, rng, i):
+        body = json.dumps({'tag_line': ' '.join(rng.sample(WORDS, 3))})
+        return client.put('/api/engineers/me/', body, content_type='application/json', **self._auth(i))
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client()
+        return client
+
+    def _one(self, scenario, number):
+        rng = random.Random(self.seed * 1_000_003 + number)
+        i = rng.randrange(len(self.engineer_users))
+        client = self._client()
+        recording = record_mongo_commands() if self.count_mongo else contextlib.nullcontext()
+        with recording as mongo:
+            started = time.perf_counter()
+            response = scenario(client, rng, i)
+            latency = (time.perf_counter() - started) * 1000
+        return round(latency, 3), response.status_code, mongo
+
+    def run(self, scenario):
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='bench') as pool:
+            list(pool.map(lambda n: self._one(scenario, -n - 1), range(self.warmup)))
+            started = time.perf_counter()
+            samples = list(pool.map(lambda n: self._one(scenario, n), range(self.requests)))
+            wall_time = time.perf_counter() - started
+        return summarize(samples, wall_time)
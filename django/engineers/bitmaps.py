@@ -0,0 +1,186 @@
+# engineers/bitmaps.py
+#
+# Per-process filter index for the engineer list: one packed bitmap per
+# (field, value) over dense row ordinals, so any AND/OR combination of the
+# list filters is a handful of bitwise ops, its total a popcount and its pages
+# a slice. The query path in views.py stays the source of truth: whenever the
+# index is not built or has not caught up recently, callers get None and run
+# the MongoDB query instead.
+
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from .filters import FILTER_FIELDS, filter_values
+from .readmodels import ProfileReadModel
+
+logger = logging.getLogger(__name__)
+
+
+class FilterPage:
+    """
+    One page of filter results: ids in _id order, the exact total and, in
+    cursor mode, whether another page follows.
+    """
+
+    def __init__(self, ids, total, has_more=False):
+        self.ids = ids
+        self.total = total
+        self.has_more = has_more
+
+
+class FilterIndex(ProfileReadModel):
+    """
+    Bitmaps per filter value, kept current like the match matrix: saves in
+    this process apply at once, other workers' writes arrive by background
+    re-reads of recently updated profiles every ENGINEER_FILTER_INDEX_REFRESH_INTERVAL
+    seconds. Queries are refused (None) when the last successful refresh is
+    older than ENGINEER_FILTER_INDEX_MAX_STALENESS seconds.
+    """
+
+    projection = {field: 1 for field in FILTER_FIELDS}
+
+    def __init__(self):
+        self._refreshing = False
+        super().__init__()
+
+    def _clear(self):
+        super()._clear()
+        self._size = 0
+        self._capacity = 0
+        self._ids = []
+        self._keys = np.empty(0, dtype='S16')  # id bytes, ordered like MongoDB orders _id
+        self._rows = {}
+        self._bitmaps = {field: {} for field in FILTER_FIELDS}
+        self._order = None  # row ordinals sorted by id; None when rows were added since
+        self._sorted_keys = None
+
+    def _grow(self, needed):
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2, 1024)
+        nbytes = (capacity + 7) // 8
+        for bitmaps in self._bitmaps.values():
+            for value, bitmap in bitmaps.items():
+                bitmaps[value] = np.concatenate([bitmap, np.zeros(nbytes - len(bitmap), dtype=np.uint8)])
+        self._keys = np.concatenate([self._keys, np.zeros(capacity - self._capacity, dtype='S16')])
+        self._capacity = capacity
+
+    def _bitmap(self, field, value):
+        bitmaps = self._bitmaps[field]
+        if value not in bitmaps:
+            bitmaps[value] = np.zeros((self._capacity + 7) // 8, dtype=np.uint8)
+        return bitmaps[value]
+
+    def _put(self, engineer_id, get):
+        row = self._rows.get(engineer_id)
+        if row is None:
+            row = self._size
+            self._grow(row + 1)
+            self._rows[engineer_id] = row
+            self._ids.append(engineer_id)
+            self._keys[row] = engineer_id.bytes
+            self._size += 1
+            self._order = None
+        byte, bit = row >> 3, np.uint8(1 << (row & 7))
+        for field in FILTER_FIELDS:
+            for bitmap in self._bitmaps[field].values():
+                bitmap[byte] &= ~bit
+            values = get(field)
+            if not isinstance(values, (list, tuple)):
+                values = [values] if values else []
+            for value in values:
+                self._bitmap(field, value)[byte] |= bit
+
+    def _refresh(self):
+        started = time.monotonic()
+        try:
+            built = self._built
+            loaded = self.load()
+            if not built:
+                logger.info("Filter index built over %d profiles in %.2fs", loaded, time.monotonic() - started)
+        except Exception:
+            logger.exception("Filter index refresh failed")
+        finally:
+            self._refreshing = False
+
+    def _schedule_refresh(self):
+        """
+        Start a background (re)load unless one is running or the index was refreshed recently.
+        """
+        with self._lock:
+            recent = (self._refreshed_at is not None and
+                      time.monotonic() - self._refreshed_at < settings.ENGINEER_FILTER_INDEX_REFRESH_INTERVAL)
+            if self._refreshing or recent:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name='engineer-filter-index', daemon=True).start()
+
+    def is_fresh(self):
+        return (self._built and self._refreshed_at is not None and
+                time.monotonic() - self._refreshed_at < settings.ENGINEER_FILTER_INDEX_MAX_STALENESS)
+
+    def apply(self, engineer):
+        """
+        Re-index `engineer` after a save in this process.
+        """
+        with self._lock:
+            if self._built:
+                self._put(engineer.id, lambda field: getattr(engineer, field))
+
+    def _matches(self, filters):
+        """
+        Bool array over rows: values within a filter OR-ed, filters AND-ed.
+        """
+        nbytes = (self._size + 7) // 8
+        packed = None
+        for field, value in zip(FILTER_FIELDS, filters):
+            values = filter_values(field, value)
+            if not values:
+                continue
+            selected = np.zeros(nbytes, dtype=np.uint8)
+            for value in values:
+                bitmap = self._bitmaps[field].get(value)
+                if bitmap is not None:
+                    selected |= bitmap[:nbytes]
+            packed = selected if packed is None else packed & selected
+        if packed is None:
+            return np.ones(self._size, dtype=bool)
+        return np.unpackbits(packed, count=self._size, bitorder='little').view(bool)
+
+    def query(self, filters, offset=0, limit=10, after_id=None, cursor=False):
+        """
+        Page through the profiles matching `filters` in _id order.
+
+        Page mode skips `offset` matches; cursor mode starts after `after_id`
+        (None for the first page). Returns a FilterPage, or None when the index
+        cannot answer and the caller should query MongoDB. Raises ValueError
+        for an empty page (limit < 1) or a negative offset.
+        """
+        if limit < 1 or offset < 0:
+            raise ValueError(f'Invalid page: offset={offset}, limit={limit}')
+        self._schedule_refresh()
+        if not self.is_fresh():
+            return None
+        with self._lock:
+            if self._order is None:
+                keys = self._keys[:self._size]
+                self._order = np.argsort(keys, kind='stable')
+                self._sorted_keys = keys[self._order]
+            matches = self._matches(filters)[self._order]
+            total = int(np.count_nonzero(matches))
+            if cursor:
+                start = 0 if after_id is None else int(np.searchsorted(self._sorted_keys, after_id.bytes, side='right'))
+                positions = np.flatnonzero(matches[start:])[:limit + 1] + start
+                has_more = len(positions) > limit
+                positions = positions[:limit]
+            else:
+                positions = np.flatnonzero(matches)[offset:offset + limit]
+                has_more = False
+            ids = [self._ids[row] for row in self._order[positions]]
+        return FilterPage(ids, total, has_more)
+
+
+filter_index = FilterIndex()
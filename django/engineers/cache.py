@@ -0,0 +1,178 @@
+# engineers/cache.py
+import calendar
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from backend.mongo import list_read_preference
+from .models import Engineer
+
+COUNT_GENERATION_KEY = 'engineers:count:generation'
+
+
+def _count_generation():
+    generation = cache.get(COUNT_GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so an evicted counter never reuses an old generation
+        cache.add(COUNT_GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(COUNT_GENERATION_KEY)
+    return generation
+
+
+async def _acount_generation():
+    generation = await cache.aget(COUNT_GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(COUNT_GENERATION_KEY, time.time_ns(), None)
+        generation = await cache.aget(COUNT_GENERATION_KEY)
+    return generation
+
+
+def _count_key(filters, generation):
+    digest = hashlib.md5(json.dumps(list(filters)).encode()).hexdigest()
+    return f'engineers:count:{generation}:{digest}'
+
+
+def estimated_engineer_count():
+    """
+    Collection size from MongoDB's metadata (estimatedDocumentCount), without scanning.
+    """
+    collection = Engineer._get_collection().with_options(read_preference=list_read_preference())
+    return collection.estimated_document_count()
+
+
+def get_engineer_count(filters, queryset):
+    """
+    Return (count, is_estimate) for the engineers matching `filters`.
+
+    Unfiltered totals come from the collection metadata; filtered totals are
+    counted once and cached until an engineer is created or updated.
+    """
+    if not any(filters):
+        return estimated_engineer_count(), True
+
+    count = cached_engineer_count(filters)
+    if count is None:
+        count = queryset.count()
+        store_engineer_count(filters, count)
+    return count, False
+
+
+def cached_engineer_count(filters):
+    return cache.get(_count_key(filters, _count_generation()))
+
+
+def store_engineer_count(filters, count):
+    cache.set(_count_key(filters, _count_generation()), count, settings.ENGINEER_COUNT_CACHE_TIMEOUT)
+
+
+# Async variants for the async views, so cache round-trips never block the event loop
+
+async def acached_engineer_count(filters):
+    return await cache.aget(_count_key(filters, await _acount_generation()))
+
+
+async def astore_engineer_count(filters, count):
+    await cache.aset(_count_key(filters, await _acount_generation()), count,
+                     settings.ENGINEER_COUNT_CACHE_TIMEOUT)
+
+
+def invalidate_engineer_counts():
+    """
+    Drop every cached count by moving to a new generation.
+    """
+    try:
+        cache.incr(COUNT_GENERATION_KEY)
+    except ValueError:
+        cache.set(COUNT_GENERATION_KEY, time.time_ns(), None)
+
+
+# Serialized profiles for the detail and "me" views, keyed by engineer id.
+# Each entry: {'data', 'etag', 'last_modified' (unix time or None)}.
+
+def _profile_key(engineer_id):
+    return f'engineers:profile:{engineer_id}'
+
+
+def _owner_key(user_id):
+    return f'engineers:owner:{user_id}'
+
+
+def get_cached_profile(engineer_id):
+    return cache.get(_profile_key(engineer_id))
+
+
+def get_cached_profile_for_user(user_id):
+    engineer_id = cache.get(_owner_key(user_id))
+    return get_cached_profile(engineer_id) if engineer_id else None
+
+
+async def aget_cached_profile(engineer_id):
+    return await cache.aget(_profile_key(engineer_id))
+
+
+async def aget_cached_profile_for_user(user_id):
+    engineer_id = await cache.aget(_owner_key(user_id))
+    return await aget_cached_profile(engineer_id) if engineer_id else None
+
+
+def get_cached_profiles(engineer_ids):
+    """
+    Cached entries for several profiles in one cache round-trip, keyed by engineer id string.
+    """
+    keys = {_profile_key(engineer_id): str(engineer_id) for engineer_id in engineer_ids}
+    return {keys[key]: entry for key, entry in cache.get_many(list(keys)).items()}
+
+
+def _profile_entry(engineer, data):
+    updated_at = engineer.updated_at
+    return {
+        'data': dict(data),
+        'etag': engineer.etag,
+        'last_modified': calendar.timegm(updated_at.utctimetuple()) if updated_at else None,
+    }
+
+
+def cache_profile(engineer, data, user_id=None):
+    """
+    Store the serialized `data` of `engineer` and return the cache entry.
+    """
+    entry = _profile_entry(engineer, data)
+    timeout = settings.ENGINEER_PROFILE_CACHE_TIMEOUT
+    cache.set(_profile_key(engineer.id), entry, timeout)
+    if user_id is not None:
+        cache.set(_owner_key(user_id), str(engineer.id), timeout)
+    return entry
+
+
+async def acache_profile(engineer, data, user_id=None):
+    """
+    cache_profile() for async views.
+    """
+    entry = _profile_entry(engineer, data)
+    timeout = settings.ENGINEER_PROFILE_CACHE_TIMEOUT
+    if user_id is None:
+        await cache.aset(_profile_key(engineer.id), entry, timeout)
+    else:
+        await cache.aset_many({_profile_key(engineer.id): entry, _owner_key(user_id): str(engineer.id)}, timeout)
+    return entry
+
+
+def cache_profiles(engineers, data):
+    """
+    cache_profile() for parallel lists of engineers and their serialized data,
+    in one cache round-trip. Returns the entries keyed by engineer id string.
+    """
+    entries = {str(engineer.id): _profile_entry(engineer, item) for engineer, item in zip(engineers, data)}
+    cache.set_many({_profile_key(engineer_id): entry for engineer_id, entry in entries.items()},
+                   settings.ENGINEER_PROFILE_CACHE_TIMEOUT)
+    return entries
+
+
+def invalidate_profile(engineer_id):
+    cache.delete(_profile_key(engineer_id))
+
+
+def invalidate_profiles(engineer_ids):
+    cache.delete_many([_profile_key(engineer_id) for engineer_id in engineer_ids])
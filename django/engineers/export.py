@@ -0,0 +1,84 @@
+# engineers/export.py
+import csv
+import datetime
+import json
+import uuid
+
+from .models import Engineer
+
+# Derived fields are rebuilt on import, so they are not exported
+DERIVED_FIELDS = ('search_terms', 'name_terms')
+
+CSV_COLUMNS = (
+    'id', 'user', 'first_name', 'last_name', 'tag_line', 'city', 'country', 'search_status',
+    'role_type', 'role_level', 'avatar', 'linkedIn', 'github', 'website', 'twitter', 'stackoverflow',
+    'updated_at',
+)
+
+
+def _json_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def export_record(document):
+    """
+    Turn a raw engineers document into a flat JSON-able record ('_id' becomes 'id').
+    """
+    record = {'id': document['_id']}
+    for key, value in document.items():
+        if key != '_id' and key not in DERIVED_FIELDS:
+            record[key] = value
+    return record
+
+
+def ndjson_line(record):
+    return json.dumps(record, default=_json_default, ensure_ascii=False) + '\n'
+
+
+def iter_engineer_documents(queryset, batch_size):
+    """
+    Stream the raw documents matched by an Engineer queryset through one
+    server-side cursor, holding at most `batch_size` documents in memory.
+    """
+    projection = {field: 0 for field in DERIVED_FIELDS}
+    cursor = Engineer._get_collection().find(queryset._query, projection, batch_size=batch_size)
+    try:
+        for document in cursor.sort('_id', 1):
+            yield document
+    finally:
+        cursor.close()
+
+
+class _Echo:
+    """
+    File-like object that hands back what csv.writer writes, for streaming.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(records):
+    """
+    Yield a header and one CSV line per record; list values are joined with ';'.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for record in records:
+        row = []
+        for column in CSV_COLUMNS:
+            value = record.get(column)
+            if isinstance(value, list):
+                value = ';'.join(value)
+            elif value is None:
+                value = ''
+            elif not isinstance(value, str):
+                value = _json_default(value)
+            if value[:1] in ('=', '+', '-', '@'):
+                value = "'" + value  # keep spreadsheets from evaluating profile text as formulas
+            row.append(value)
+        yield writer.writerow(row)
@@ -0,0 +1,69 @@
+# engineers/filters.py
+from .models import Engineer
+
+# Engineer fields behind the filter tuple, and the query parameters they are read from
+FILTER_FIELDS = ('country', 'role_type', 'role_level')
+FILTER_PARAMS = ('country', 'roleType', 'roleLevel')
+
+# Multi-select filters, comma-separated ('senior,principal_staff'). Only fields
+# whose values are choice keys: country names can contain commas themselves.
+MULTI_VALUE_FIELDS = ('role_type', 'role_level')
+
+
+def filter_values(field, value):
+    """
+    The values of one filter of the tuple.
+    """
+    if not value:
+        return []
+    return value.split(',') if field in MULTI_VALUE_FIELDS else [value]
+
+
+def engineer_filters(query_params):
+    """
+    Read the list filters from the query string as a (country, role_type, role_level) tuple.
+    Values are trimmed; multi-select ones are also deduplicated and sorted so
+    equal selections compare equal.
+    """
+    filters = []
+    for field, param in zip(FILTER_FIELDS, FILTER_PARAMS):
+        value = query_params.get(param, '').strip()
+        if field in MULTI_VALUE_FIELDS:
+            value = ','.join(sorted({item.strip() for item in value.split(',') if item.strip()}))
+        filters.append(value)
+    return tuple(filters)
+
+
+def filter_query(filters):
+    """
+    The MongoDB filter document for a filter tuple from engineer_filters(). Values
+    within a filter are OR-ed, the filters themselves AND-ed.
+    """
+    query = {}
+    for field, value in zip(FILTER_FIELDS, filters):
+        values = filter_values(field, value)
+        if len(values) == 1:
+            query[field] = values[0]
+        elif values:
+            query[field] = {'$in': values}
+    return query
+
+
+def filter_engineers(filters, queryset=None):
+    """
+    Apply a filter tuple from engineer_filters() to an Engineer queryset.
+    """
+    engineers = queryset if queryset is not None else Engineer.objects()
+    query = filter_query(filters)
+    return engineers.filter(__raw__=query) if query else engineers
+
+
+def engineers_by_ids(ids, fields=None):
+    """
+    Raw documents for `ids` from a single $in query, in the order given;
+    ids without a profile are skipped. Loads the list fields by default.
+    """
+    from .serializers import ENGINEER_LIST_FIELDS  # serializers -> hooks -> bitmaps -> filters
+    documents = Engineer.objects(id__in=list(ids)).only(*(fields or ENGINEER_LIST_FIELDS)).as_pymongo()
+    by_id = {document['_id']: document for document in documents}
+    return [by_id[engineer_id] for engineer_id in ids if engineer_id in by_id]
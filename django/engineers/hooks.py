@@ -0,0 +1,20 @@
+# engineers/hooks.py
+from .cache import invalidate_engineer_counts, invalidate_profile
+from .bitmaps import filter_index
+from .matching import engineer_matrix
+from .stats import record_engineer_change, stat_snapshot
+
+
+def engineer_saved(before, engineer):
+    """
+    Bring derived data (cached counts and profiles, stats, the in-memory read models) in line after a profile write.
+
+    `before` is stat_snapshot() of the profile taken before the write, or None
+    when the profile was just created. Every code path that writes profiles
+    calls this once per profile.
+    """
+    invalidate_engineer_counts()
+    invalidate_profile(engineer.id)
+    record_engineer_change(before, stat_snapshot(engineer))
+    engineer_matrix.apply(engineer)
+    filter_index.apply(engineer)
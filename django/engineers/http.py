@@ -0,0 +1,21 @@
+# engineers/http.py
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def profile_response(request, entry, response_class=Response):
+    """
+    Answer with a cached profile entry, or 304 when the client's copy is current.
+    The precondition check happens before any serialization or database access.
+    Async views pass a plain Django response class such as JsonResponse.
+    """
+    response = get_conditional_response(request, etag=entry['etag'], last_modified=entry['last_modified'])
+    if response is None:
+        response = response_class(entry['data'], status=status.HTTP_200_OK)
+    response['ETag'] = entry['etag']
+    if entry['last_modified']:
+        response['Last-Modified'] = http_date(entry['last_modified'])
+    response['Cache-Control'] = 'private, no-cache'
+    return response
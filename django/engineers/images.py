@@ -0,0 +1,32 @@
+# engineers/images.py
+import os
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+# Refuse decompression bombs well before they exhaust memory
+Image.MAX_IMAGE_PIXELS = 40_000_000
+
+
+def avatar_variants(path, workdir):
+    """
+    Decode the image at `path` and write one square WebP per AVATAR_VARIANT_SIZES into `workdir`.
+
+    EXIF orientation is applied and every bit of metadata (EXIF, ICC, XMP) is
+    dropped. Returns {size: (variant_path, width, height)}.
+    """
+    largest = max(settings.AVATAR_VARIANT_SIZES)
+    variants = {}
+    with Image.open(path) as source:
+        # Let the JPEG decoder downscale while decoding instead of after
+        source.draft('RGB', (largest * 2, largest * 2))
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        image.info = {}
+
+        for size in sorted(settings.AVATAR_VARIANT_SIZES):
+            variant = ImageOps.fit(image, (size, size), Image.LANCZOS)
+            variant_path = os.path.join(workdir, f'{size}.webp')
+            variant.save(variant_path, 'WEBP', quality=settings.AVATAR_WEBP_QUALITY, method=6)
+            variants[size] = (variant_path, variant.width, variant.height)
+    return variants
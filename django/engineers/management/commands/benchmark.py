@@ -0,0 +1,122 @@
+# engineers/management/commands/benchmark.py
+import datetime
+import json
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from mongoengine import disconnect
+from mongoengine.connection import get_db
+from backend.mongo import connect_mongo
+from engineers.benchmark import Benchmark, seed
+from engineers.models import Engineer
+from users.cache import user_cache
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Seed synthetic users and engineers into a scratch database and report latency '
+            'percentiles, throughput and Mongo op counts per endpoint as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mongo-uri', default='mongodb://localhost:27017/angulartalents_bench',
+                            help='Scratch database; its users and engineers collections are dropped')
+        parser.add_argument('--mongomock', action='store_true',
+                            help='Run against an in-memory mongomock database (no Mongo op counts, no async views)')
+        parser.add_argument('--engineers', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=0, help='Defaults to --engineers')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--only', default='', help='Comma-separated endpoint names to run')
+        parser.add_argument('--output', '-o', default='-', help='File to write, "-" for stdout')
+
+    def handle(self, *args, **options):
+        self._connect(options)
+        db_name = get_db().name
+        if 'bench' not in db_name and not options['mongomock']:
+            raise CommandError(f'Refusing to seed "{db_name}": use a scratch database whose name contains "bench"')
+
+        User.drop_collection()
+        Engineer.drop_collection()
+        User.ensure_indexes()
+        Engineer.ensure_indexes()
+        cache.clear()
+        user_cache.clear()
+
+        started = time.monotonic()
+        users, engineer_ids = seed(options['engineers'], options['users'], seed=options['seed'])
+        self.stderr.write(f'Seeded {len(users)} users and {len(engineer_ids)} engineers '
+                          f'in {time.monotonic() - started:.1f}s')
+
+        benchmark = Benchmark(users, engineer_ids, concurrency=options['concurrency'],
+                              requests=options['requests'], warmup=options['warmup'],
+                              page_size=options['page_size'], seed=options['seed'],
+                              count_mongo=not options['mongomock'])
+        scenarios = benchmark.scenarios()
+        if options['only']:
+            names = [name.strip() for name in options['only'].split(',') if name.strip()]
+            unknown = set(names) - set(scenarios)
+            if unknown:
+                raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+            scenarios = {name: scenarios[name] for name in names}
+
+        results = {}
+        # The test client sends Host: testserver
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for name, scenario in scenarios.items():
+                results[name] = benchmark.run(scenario)
+                summary = results[name]
+                self.stderr.write(f'{name:40} p50 {summary["p50_ms"]:>9.2f} ms  p99 {summary["p99_ms"]:>9.2f} ms  '
+                                  f'{summary["throughput_rps"]:>8.1f} req/s')
+
+        report = {
+            'meta': {
+                'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+                'commit': self._commit(),
+                'python': sys.version.split()[0],
+                'engineers': len(engineer_ids),
+                'users': len(users),
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'warmup': options['warmup'],
+                'page_size': options['page_size'],
+                'seed': options['seed'],
+                'mongomock': options['mongomock'],
+                'async_views': settings.ASYNC_VIEWS,
+                'jwt_embed_user_claims': settings.JWT_EMBED_USER_CLAIMS,
+            },
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+
+    def _connect(self, options):
+        disconnect()
+        if options['mongomock']:
+            try:
+                import mongomock
+            except ImportError:
+                raise CommandError('--mongomock needs the mongomock package (pip install mongomock)')
+            connect_mongo(host='mongodb://localhost/angulartalents_bench', mongo_client_class=mongomock.MongoClient,
+                          event_listeners=[])
+        else:
+            connect_mongo(host=options['mongo_uri'])
+
+    def _commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,93 @@
+# engineers/management/commands/benchmark_json.py
+import datetime
+import io
+import json
+import random
+import sys
+import timeit
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from backend import parsers, renderers
+from engineers.benchmark import synthetic_engineer
+from engineers.export import export_record
+from engineers.serializers import EngineerListSerializer
+
+
+class Command(BaseCommand):
+    help = ('Compare encode/decode time and output size of DRF\'s JSON renderer and parser against '
+            'the project\'s fast ones on synthetic list payloads, as JSON. No database is used.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,50,200', help='Comma-separated numbers of engineers per payload')
+        parser.add_argument('--iterations', type=int, default=200, help='Encodes per timing run')
+        parser.add_argument('--repeat', type=int, default=5, help='Timing runs; the fastest is reported')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', '-o', default='-', help='File to write, "-" for stdout')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated integers')
+        if renderers.orjson is None:
+            self.stderr.write(self.style.WARNING('orjson is not installed: the fast renderer and parser '
+                                                 'fall back to the stdlib and should match DRF'))
+
+        rng = random.Random(options['seed'])
+        now = datetime.datetime.utcnow()
+        engineers = [synthetic_engineer(rng, i, uuid.uuid4(), now) for i in range(max(sizes))]
+        documents = [engineer.to_mongo().to_dict() for engineer in engineers]
+
+        results = {}
+        for size in sizes:
+            payloads = {
+                # What a list page returns: serialized cards, ids and URLs as strings
+                'list_page': {'engineers': EngineerListSerializer(documents[:size], many=True).data,
+                              'total': size, 'total_is_estimate': False},
+                # Raw documents as exported: native UUIDs and datetimes left to the encoder
+                'documents': [export_record(document) for document in documents[:size]],
+            }
+            for name, payload in payloads.items():
+                key = f'{name}_{size}'
+                results[key] = self._compare(payload, options['iterations'], options['repeat'])
+                drf, fast = results[key]['drf'], results[key]['fast']
+                self.stderr.write(f'{key:20} encode {drf["encode_us"]:>10.1f} -> {fast["encode_us"]:>10.1f} us  '
+                                  f'decode {drf["decode_us"]:>10.1f} -> {fast["decode_us"]:>10.1f} us  '
+                                  f'{drf["bytes"]:>8} -> {fast["bytes"]:>8} bytes')
+
+        report = {
+            'meta': {
+                'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+                'python': sys.version.split()[0],
+                'orjson': getattr(renderers.orjson, '__version__', None),
+                'iterations': options['iterations'],
+                'repeat': options['repeat'],
+                'seed': options['seed'],
+            },
+            'payloads': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+
+    def _compare(self, payload, iterations, repeat):
+        comparison = {}
+        for name, renderer, parser in (('drf', JSONRenderer(), JSONParser()),
+                                       ('fast', renderers.FastJSONRenderer(), parsers.FastJSONParser())):
+            body = renderer.render(payload)
+            encode = min(timeit.repeat(lambda: renderer.render(payload), number=iterations, repeat=repeat))
+            decode = min(timeit.repeat(lambda: parser.parse(io.BytesIO(body)), number=iterations, repeat=repeat))
+            comparison[name] = {
+                'encode_us': round(encode / iterations * 1e6, 2),
+                'decode_us': round(decode / iterations * 1e6, 2),
+                'bytes': len(body),
+            }
+        comparison['encode_speedup'] = round(comparison['drf']['encode_us'] / comparison['fast']['encode_us'], 2)
+        return comparison
@@ -0,0 +1,81 @@
+# engineers/management/commands/ensure_indexes.py
+import datetime
+import uuid
+
+from django.core.management.base import BaseCommand
+from engineers.models import Engineer, UploadJob
+from users.models import User
+
+
+def query_shapes():
+    """
+    Representative queries issued by the API, one per distinct filter shape.
+    The values are placeholders: only the shape matters to the query planner.
+    """
+    some_id = uuid.uuid4()
+    return [
+        ('users: login by email', User.objects(email='someone@example.com')),
+        ('users: token user by id', User.objects(id=some_id)),
+        ('engineers: profile by user', Engineer.objects(user=some_id)),
+        ('engineers: list by country', Engineer.objects(country='Germany').order_by('id')),
+        ('engineers: list by role_type', Engineer.objects(role_type='contract_full_time').order_by('id')),
+        ('engineers: list by role_level', Engineer.objects(role_level='senior').order_by('id')),
+        ('engineers: list by country + role_type',
+         Engineer.objects(country='Germany', role_type='contract_full_time').order_by('id')),
+        ('engineers: list by country + role_level',
+         Engineer.objects(country='Germany', role_level='senior').order_by('id')),
+        ('engineers: cursor page', Engineer.objects(id__gt=some_id).order_by('id')),
+        ('engineers: match matrix refresh', Engineer.objects(updated_at__gte=datetime.datetime.utcnow())),
+        ('upload_jobs: status poll', UploadJob.objects(id=some_id, expires_at__gt=datetime.datetime.utcnow())),
+    ]
+
+
+def winning_indexes(plan):
+    """
+    Walk an explain() plan tree and collect the index names it uses,
+    or COLLSCAN when a stage scans the whole collection.
+    """
+    found = []
+    if isinstance(plan, dict):
+        if plan.get('stage') == 'COLLSCAN':
+            found.append('COLLSCAN')
+        if 'indexName' in plan:
+            found.append(plan['indexName'])
+        for value in plan.values():
+            found.extend(winning_indexes(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            found.extend(winning_indexes(item))
+    return found
+
+
+class Command(BaseCommand):
+    help = 'Build the declared MongoDB indexes in the background and report which queries each one covers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-build', action='store_true', help='Only report, do not build indexes')
+
+    def handle(self, *args, **options):
+        for document in (User, Engineer, UploadJob):
+            collection = document._get_collection()
+            if not options['skip_build']:
+                self.stdout.write(f"Building indexes on '{collection.name}'...")
+                document.ensure_indexes()
+            for name, info in collection.index_information().items():
+                self.stdout.write(f"  {name}: {info['key']}")
+
+        self.stdout.write('\nQuery coverage:')
+        coverage = {}
+        for label, queryset in query_shapes():
+            plan = queryset.explain().get('queryPlanner', {}).get('winningPlan', {})
+            indexes = sorted(set(winning_indexes(plan))) or ['COLLSCAN']
+            for index in indexes:
+                coverage.setdefault(index, []).append(label)
+            style = self.style.ERROR if 'COLLSCAN' in indexes else self.style.SUCCESS
+            self.stdout.write(style(f"  {label}: {', '.join(indexes)}"))
+
+        self.stdout.write('\nIndexes by query:')
+        for index, labels in sorted(coverage.items()):
+            self.stdout.write(f'  {index}')
+            for label in labels:
+                self.stdout.write(f'    - {label}')
@@ -0,0 +1,40 @@
+# engineers/management/commands/export_engineers.py
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from engineers.export import export_record, iter_engineer_documents, ndjson_line
+from engineers.filters import filter_engineers
+
+
+class Command(BaseCommand):
+    help = 'Stream engineer profiles as NDJSON (one JSON object per line)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-', help='File to write, "-" for stdout')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--country', default='')
+        parser.add_argument('--role-type', default='')
+        parser.add_argument('--role-level', default='')
+
+    def handle(self, *args, **options):
+        filters = (options['country'], options['role_type'], options['role_level'])
+        queryset = filter_engineers(filters)
+        output = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8')
+
+        started, exported = time.monotonic(), 0
+        try:
+            for document in iter_engineer_documents(queryset, options['batch_size']):
+                output.write(ndjson_line(export_record(document)))
+                exported += 1
+                if exported % 10000 == 0:
+                    self._progress(exported, started)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        self._progress(exported, started, done=True)
+
+    def _progress(self, exported, started, done=False):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        message = f'{"Exported" if done else "Exporting..."} {exported} profiles in {elapsed:.1f}s ({exported / elapsed:.0f}/s)'
+        self.stderr.write(self.style.SUCCESS(message) if done else message)
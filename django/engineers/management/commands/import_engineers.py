@@ -0,0 +1,122 @@
+# engineers/management/commands/import_engineers.py
+import datetime
+import json
+import sys
+import time
+import uuid
+
+from bson import DBRef
+from django.core.management.base import BaseCommand
+from pymongo import ReplaceOne
+from mongoengine.errors import ValidationError as DocumentValidationError
+from rest_framework.exceptions import ValidationError
+from engineers.cache import invalidate_engineer_counts, invalidate_profiles
+from engineers.models import Engineer
+from engineers.serializers import EngineerSerializer
+from engineers.stats import rebuild_engineer_stats
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Bulk load engineer profiles from NDJSON (as written by export_engineers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='NDJSON file to read, "-" for stdin')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--skip-user-check', action='store_true',
+                            help='Do not verify that referenced users exist')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.check_users = not options['skip_user_check']
+        self.collection = Engineer._get_collection()
+        # One serializer instance validates every record, so its fields are only built once
+        self.validator = EngineerSerializer()
+        self.written = self.invalid = 0
+        self.started = time.monotonic()
+
+        source = sys.stdin if options['input'] == '-' else open(options['input'], encoding='utf-8')
+        try:
+            batch = []
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                document = self._build_document(line_number, line)
+                if document is not None:
+                    batch.append(document)
+                if len(batch) >= self.batch_size:
+                    self._write(batch)
+                    batch = []
+            if batch:
+                self._write(batch)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        # Derived data cannot follow a bulk load incrementally
+        rebuild_engineer_stats()
+        invalidate_engineer_counts()
+
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        self.stderr.write(self.style.SUCCESS(
+            f'Imported {self.written} profiles in {elapsed:.1f}s ({self.written / elapsed:.0f}/s), '
+            f'{self.invalid} rejected'
+        ))
+
+    def _reject(self, line_number, reason):
+        self.invalid += 1
+        self.stderr.write(self.style.WARNING(f'Line {line_number}: {reason}'))
+
+    def _build_document(self, line_number, line):
+        try:
+            record = json.loads(line)
+            user_id = uuid.UUID(str(record.pop('user')))
+            engineer_id = uuid.UUID(str(record.pop('id'))) if record.get('id') else uuid.uuid4()
+            validated = self.validator.run_validation(record)
+        except ValidationError as e:
+            self._reject(line_number, e.detail)
+            return None
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._reject(line_number, f'malformed record ({e})')
+            return None
+
+        # A DBRef is what validate() accepts for a reference without loading the user
+        engineer = Engineer(id=engineer_id, user=DBRef(User._get_collection_name(), user_id), **validated)
+        engineer.clean()
+        engineer.updated_at = datetime.datetime.utcnow()
+        try:
+            # The serializer does not know the model's choices or URL rules
+            engineer.validate()
+        except DocumentValidationError as e:
+            self._reject(line_number, {field: str(error) for field, error in (e.errors or {}).items()} or str(e))
+            return None
+        return engineer.to_mongo().to_dict()
+
+    def _write(self, batch):
+        if self.check_users:
+            user_ids = {document['user'] for document in batch}
+            existing = set(User.objects(id__in=list(user_ids)).scalar('id'))
+            missing = user_ids - existing
+            if missing:
+                self.invalid += sum(1 for document in batch if document['user'] in missing)
+                self.stderr.write(self.style.WARNING(f'Skipping profiles of {len(missing)} unknown users'))
+                batch = [document for document in batch if document['user'] not in missing]
+
+        if batch:
+            # Replaced profiles move to a new version so ETags issued for the old content stop matching
+            ids = [document['_id'] for document in batch]
+            versions = {document['_id']: document.get('version') or 0
+                        for document in self.collection.find({'_id': {'$in': ids}}, {'version': 1})}
+            for document in batch:
+                document['version'] = versions.get(document['_id'], 0) + 1
+            # Upserts keyed on _id make re-running an import safe
+            self.collection.bulk_write(
+                [ReplaceOne({'_id': document['_id']}, document, upsert=True) for document in batch],
+                ordered=False,
+            )
+            # The bulk write bypasses engineer_saved(); drop the cached profiles it would have
+            invalidate_profiles(ids)
+            self.written += len(batch)
+
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        self.stderr.write(f'Importing... {self.written} profiles ({self.written / elapsed:.0f}/s)')
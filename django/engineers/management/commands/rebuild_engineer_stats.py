@@ -0,0 +1,13 @@
+# engineers/management/commands/rebuild_engineer_stats.py
+from django.core.management.base import BaseCommand
+from engineers.stats import rebuild_engineer_stats, STAT_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Recount the materialized engineer statistics from the engineers collection'
+
+    def handle(self, *args, **options):
+        stats = rebuild_engineer_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt engineer stats: {stats['total']} profiles"))
+        for field in STAT_FIELDS:
+            self.stdout.write(f"  {field}: {len(stats[field])} distinct values")
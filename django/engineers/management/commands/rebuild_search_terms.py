@@ -0,0 +1,35 @@
+# engineers/management/commands/rebuild_search_terms.py
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from engineers.models import Engineer
+from engineers.text import SEARCH_FIELDS, profile_terms
+
+
+class Command(BaseCommand):
+    help = 'Recompute the search tokens of every engineer profile (needed once for profiles saved before search existed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        collection = Engineer._get_collection()
+        cursor = collection.find({}, {field: 1 for field in SEARCH_FIELDS}, batch_size=batch_size)
+
+        updates, done = [], 0
+        for document in cursor:
+            search_terms, name_terms = profile_terms(document.get)
+            updates.append(UpdateOne(
+                {'_id': document['_id']},
+                {'$set': {'search_terms': search_terms, 'name_terms': name_terms}},
+            ))
+            if len(updates) >= batch_size:
+                collection.bulk_write(updates, ordered=False)
+                done += len(updates)
+                updates = []
+                self.stdout.write(f'{done} profiles indexed...')
+        if updates:
+            collection.bulk_write(updates, ordered=False)
+            done += len(updates)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search terms for {done} profiles'))
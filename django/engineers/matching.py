@@ -0,0 +1,221 @@
+# engineers/matching.py
+#
+# Recruiter match scoring over a per-process, array-backed copy of the profile
+# attributes that matter for fit. Every profile is scored in one vectorized
+# pass and the top k come out of a partial sort, so a query never touches
+# MongoDB until the winning profiles are loaded for display.
+
+import math
+import time
+
+import numpy as np
+from django.conf import settings
+from .models import Engineer
+from .readmodels import ProfileReadModel
+from .text import tokenize
+
+MATCH_CRITERIA = ('country', 'search_status', 'role_type', 'role_level', 'skills')
+# Single-valued fields become integer codes; multi-valued ones become bitsets
+CODED_FIELDS = ('country', 'search_status')
+BITSET_FIELDS = {
+    'role_type': Engineer._fields['role_type'].field.choices,
+    'role_level': Engineer._fields['role_level'].field.choices,
+}
+MISSING = -1
+
+
+def _skill_bits():
+    skills = tuple(settings.ENGINEER_MATCH_SKILLS)
+    if len(skills) > 64:
+        raise ValueError('ENGINEER_MATCH_SKILLS holds at most 64 skills')
+    return {skill: 1 << i for i, skill in enumerate(skills)}
+
+
+def parse_match_query(data):
+    """
+    Validate a match request body:
+    {"criteria": {field: [values]}, "weights": {field: number}, "limit": k}.
+
+    Values may also be comma-separated strings. Returns (criteria, weights, limit);
+    raises ValueError with a message for the client.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be an object')
+    raw_criteria = data.get('criteria') or {}
+    raw_weights = data.get('weights') or {}
+    if not isinstance(raw_criteria, dict) or not isinstance(raw_weights, dict):
+        raise ValueError('criteria and weights must be objects')
+    unknown = (set(raw_criteria) | set(raw_weights)) - set(MATCH_CRITERIA)
+    if unknown:
+        raise ValueError(f'Unknown criteria: {", ".join(sorted(unknown))}')
+
+    criteria = {}
+    for field, values in raw_criteria.items():
+        if isinstance(values, str):
+            values = values.split(',')
+        if not isinstance(values, list):
+            raise ValueError(f'{field} must be a list of values')
+        values = [str(value).strip() for value in values if str(value).strip()]
+        invalid = [value for value in values if field in BITSET_FIELDS and value not in BITSET_FIELDS[field]]
+        if invalid:
+            raise ValueError(f'Unknown {field} values: {", ".join(invalid)}')
+        if values:
+            criteria[field] = values
+    if not criteria:
+        raise ValueError('Give at least one criterion')
+
+    weights = {}
+    for field in criteria:
+        try:
+            weights[field] = float(raw_weights.get(field, 1))
+        except (TypeError, ValueError):
+            raise ValueError(f'Weight for {field} must be a number')
+        if not math.isfinite(weights[field]):
+            raise ValueError(f'Weight for {field} must be a finite number')
+        if weights[field] < 0:
+            raise ValueError(f'Weight for {field} cannot be negative')
+
+    try:
+        limit = int(data.get('limit', 20))
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    limit = max(1, min(limit, settings.ENGINEER_MATCH_MAX_RESULTS))
+    return criteria, weights, limit
+
+
+class EngineerMatrix(ProfileReadModel):
+    """
+    Profile attributes as parallel NumPy arrays, one row per engineer.
+
+    Built from MongoDB on first use, then kept current two ways: profile
+    writes in this process apply their row straight away (hooks.engineer_saved),
+    and every ENGINEER_MATCH_REFRESH_INTERVAL seconds the profiles updated since
+    the last refresh are re-read, which picks up other workers' writes.
+    ENGINEER_MATCH_SKILLS is read when the matrix is created or reset.
+    """
+
+    projection = {'country': 1, 'search_status': 1, 'role_type': 1, 'role_level': 1, 'search_terms': 1}
+
+    def _clear(self):
+        super()._clear()
+        self._size = 0
+        self._ids = []
+        self._rows = {}
+        self._codes = {field: {} for field in CODED_FIELDS}
+        self._skill_bits = _skill_bits()
+        self._allocate(1024)
+
+    def _allocate(self, capacity):
+        self._capacity = capacity
+        self._coded = {field: np.full(capacity, MISSING, dtype=np.int32) for field in CODED_FIELDS}
+        self._bitsets = {field: np.zeros(capacity, dtype=np.uint8) for field in BITSET_FIELDS}
+        self._skills = np.zeros(capacity, dtype=np.uint64)
+
+    def _grow(self, needed):
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2)
+        coded, bitsets, skills = self._coded, self._bitsets, self._skills
+        self._allocate(capacity)
+        for field in CODED_FIELDS:
+            self._coded[field][:self._size] = coded[field][:self._size]
+        for field in BITSET_FIELDS:
+            self._bitsets[field][:self._size] = bitsets[field][:self._size]
+        self._skills[:self._size] = skills[:self._size]
+
+    def _code(self, field, value):
+        if not value:
+            return MISSING
+        codes = self._codes[field]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def _put(self, engineer_id, get):
+        row = self._rows.get(engineer_id)
+        if row is None:
+            row = self._size
+            self._grow(row + 1)
+            self._rows[engineer_id] = row
+            self._ids.append(engineer_id)
+            self._size += 1
+        for field in CODED_FIELDS:
+            self._coded[field][row] = self._code(field, get(field))
+        for field, choices in BITSET_FIELDS.items():
+            values = get(field) or ()
+            self._bitsets[field][row] = sum(1 << i for i, choice in enumerate(choices) if choice in values)
+        skills = 0
+        for term in get('search_terms') or ():
+            skills |= self._skill_bits.get(term, 0)
+        self._skills[row] = skills
+
+    def _ensure_fresh(self):
+        if self._built and time.monotonic() - self._refreshed_at < settings.ENGINEER_MATCH_REFRESH_INTERVAL:
+            return
+        self.load()
+
+    def apply(self, engineer):
+        """
+        Bring `engineer`'s row up to date after a save in this process.
+        """
+        with self._lock:
+            if self._built:
+                self._put(engineer.id, lambda field: getattr(engineer, field))
+
+    def top_matches(self, criteria, weights, limit):
+        """
+        Score every profile against `criteria` and return (ids, scores, matched, unknown_skills).
+
+        Each criterion scores 0..1: a coded field scores 1 when the profile's value
+        is one of those asked for, a multi-valued field or skills score the share
+        of asked-for values the profile has. Scores are the weighted mean, best
+        first; profiles scoring 0 are left out, `matched` counts the rest.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            size = self._size
+            scores = np.zeros(size, dtype=np.float32)
+            unknown_skills = []
+
+            for field in CODED_FIELDS:
+                if field in criteria:
+                    wanted = [self._codes[field][value] for value in criteria[field] if value in self._codes[field]]
+                    if wanted:
+                        scores += weights[field] * np.isin(self._coded[field][:size], wanted)
+
+            for field, choices in BITSET_FIELDS.items():
+                if field in criteria:
+                    bits = [1 << choices.index(value) for value in criteria[field] if value in choices]
+                    masks = self._bitsets[field][:size]
+                    for bit in bits:
+                        scores += (weights[field] / len(criteria[field])) * ((masks & bit) != 0)
+
+            if 'skills' in criteria:
+                skill_bits = self._skill_bits
+                asked = []
+                for skill in criteria['skills']:
+                    tokens = tokenize(skill)
+                    if len(tokens) == 1 and tokens[0] in skill_bits:
+                        asked.append(skill_bits[tokens[0]])
+                    else:
+                        unknown_skills.append(skill)
+                masks = self._skills[:size]
+                for bit in asked:
+                    scores += (weights['skills'] / len(criteria['skills'])) * ((masks & np.uint64(bit)) != 0)
+
+            ids = self._ids
+
+        total_weight = sum(weights.values())
+        if total_weight:
+            scores /= total_weight
+        matched = int(np.count_nonzero(scores))
+        k = min(limit, matched)
+        if k == 0:
+            return [], [], 0, unknown_skills
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Best score first; ties keep load order so pages are stable
+        top = top[np.lexsort((top, -scores[top]))]
+        return [ids[row] for row in top], scores[top].tolist(), matched, unknown_skills
+
+
+engineer_matrix = EngineerMatrix()
@@ -1,5 +1,7 @@
-from mongoengine import Document, StringField, UUIDField, ReferenceField, ListField, URLField
+from mongoengine import Document, StringField, UUIDField, ReferenceField, ListField, URLField, MapField, IntField, DictField, DateTimeField
 from users.models import User
+from .text import profile_terms
+import datetime
 import uuid
 
 class Engineer(Document):
@@ -11,6 +13,8 @@ class Engineer(Document):
     city = StringField()
     country = StringField()
     avatar = StringField()
+    # Thumbnail URLs keyed by pixel size, e.g. {'128': 'https://...'}
+    avatar_variants = MapField(StringField())
     bio = StringField()
     search_status = StringField()
     role_type = ListField(StringField(choices=('contract_part_time', 'contract_full_time', 'employee_part_time', 'employee_full_time')))
@@ -20,5 +24,82 @@ class Engineer(Document):
     github = URLField()
     twitter = URLField(required=False)
     stackoverflow = URLField(required=False)
+    # Derived in clean(): normalized tokens for search, and the name/city subset for prefix boosts
+    search_terms = ListField(StringField())
+    name_terms = ListField(StringField())
+    # Bumped on every write; ETags and Last-Modified derive from these
+    version = IntField(default=0)
+    updated_at = DateTimeField()
 
-    meta = {'collection': 'engineers'}
+    meta = {
+        'collection': 'engineers',
+        # Built by `manage.py ensure_indexes` rather than on first access
+        'auto_create_index': False,
+        'index_background': True,
+        'indexes': [
+            # EngineerMeView and the profile PUT look profiles up by owner
+            'user',
+            # List filters, each ending on _id so cursor pages walk the index in order.
+            # role_type/role_level are arrays, so they cannot share one compound index.
+            ('country', 'id'),
+            ('role_type', 'id'),
+            ('role_level', 'id'),
+            ('country', 'role_type', 'id'),
+            ('country', 'role_level', 'id'),
+            # Talent search: anchored prefix regexes on the token list
+            'search_terms',
+            # Incremental refresh of the match matrix (engineers/matching.py)
+            'updated_at',
+        ],
+    }
+
+    def save(self, *args, **kwargs):
+        self.version = (self.version or 0) + 1
+        self.updated_at = datetime.datetime.utcnow()
+        return super().save(*args, **kwargs)
+
+    def clean(self):
+        self.search_terms, self.name_terms = profile_terms(lambda field: getattr(self, field))
+
+    @property
+    def etag(self):
+        return f'"{self.id}-{self.version or 0}"'
+
+
+class EngineerStats(Document):
+    """
+    Materialized profile counts, kept current by engineers/stats.py.
+    A single document with id 'global'; distribution keys are escaped by stats.stat_key().
+    """
+    id = StringField(primary_key=True, default='global')
+    total = IntField(default=0)
+    country = DictField()
+    role_type = DictField()
+    role_level = DictField()
+    search_status = DictField()
+    version = IntField(default=0)
+    updated_at = DateTimeField()
+
+    meta = {'collection': 'engineer_stats'}
+
+
+class UploadJob(Document):
+    """
+    Status of a background avatar upload (engineers/uploads.py). Kept in MongoDB
+    so any worker can answer the status poll; MongoDB drops it at expires_at.
+    """
+    id = UUIDField(primary_key=True)
+    owner = StringField(required=True)
+    status = StringField(required=True)
+    result = DictField()
+    error = StringField()
+    expires_at = DateTimeField(required=True)
+
+    meta = {
+        'collection': 'upload_jobs',
+        'auto_create_index': False,
+        'index_background': True,
+        'indexes': [
+            {'fields': ['expires_at'], 'expireAfterSeconds': 0},
+        ],
+    }
@@ -0,0 +1,53 @@
+# engineers/pagination.py
+import base64
+import json
+import uuid
+
+from django.conf import settings
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidPage(ValueError):
+    pass
+
+
+def page_params(query_params):
+    """
+    Read (page, limit) from the query string: page >= 1 and 1 <= limit, with
+    limit capped at ENGINEER_PAGE_MAX_LIMIT. Raises InvalidPage with a message
+    for the client.
+    """
+    try:
+        page = int(query_params.get('page', 1))
+        limit = int(query_params.get('limit', 10))
+    except (TypeError, ValueError):
+        raise InvalidPage('page and limit must be integers')
+    if page < 1 or limit < 1:
+        raise InvalidPage('page and limit must be at least 1')
+    return page, min(limit, settings.ENGINEER_PAGE_MAX_LIMIT)
+
+
+def encode_cursor(last_id):
+    """
+    Build the opaque cursor that points just past the engineer with `last_id`.
+    """
+    payload = json.dumps({'id': str(last_id)}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Return the engineer id a cursor points past, or None for an empty cursor
+    (the first page). Raises InvalidCursor for anything we did not issue.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return uuid.UUID(payload['id'])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor(cursor)
@@ -0,0 +1,91 @@
+# engineers/readmodels.py
+#
+# Per-process copies of a few profile fields (the match matrix, the filter
+# index), built from one full read and kept current by re-reading the
+# profiles whose updated_at moved.
+
+import datetime
+import threading
+import time
+
+from django.conf import settings
+from .models import Engineer
+
+
+def read_profiles(projection, since=None, batch_size=5000):
+    """
+    Stream raw engineer documents (`projection` plus updated_at) for the
+    per-process read models: every profile, or those updated at or after `since`.
+    """
+    query = {} if since is None else {'updated_at': {'$gte': since}}
+    cursor = Engineer._get_collection().find(query, {**projection, 'updated_at': 1}, batch_size=batch_size)
+    try:
+        yield from cursor
+    finally:
+        cursor.close()
+
+
+class ProfileReadModel:
+    """
+    Base for the read models. Subclasses set `projection` and implement
+    `_put(engineer_id, get)`, which indexes one profile where `get(field)` reads
+    a field as in text.profile_terms(); `_clear()` must call the base one.
+    """
+
+    projection = {}
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self._built = False
+        self._watermark = None
+        self._refreshed_at = None
+
+    def _put(self, engineer_id, get):
+        raise NotImplementedError
+
+    def load_documents(self, documents):
+        """
+        Index raw engineer documents, as read_profiles() yields them, and count
+        the model as built and refreshed from then on. Returns how many were indexed.
+        """
+        started = time.monotonic()
+        loaded = 0
+        for document in documents:
+            with self._lock:
+                self._put(document['_id'], document.get)
+                updated_at = document.get('updated_at')
+                if updated_at and (self._watermark is None or updated_at > self._watermark):
+                    self._watermark = updated_at
+            loaded += 1
+        with self._lock:
+            self._built = True
+            self._refreshed_at = started
+        return loaded
+
+    def refresh_since(self):
+        """
+        Where the next load() starts reading: None for a full read while unbuilt.
+
+        updated_at is stamped from each worker's clock before its write commits,
+        so a profile stamped earlier than the newest one seen can still appear
+        later. Reads go back ENGINEER_READ_MODEL_LOOKBACK seconds behind the
+        watermark to pick those up; re-reading a profile is harmless.
+        """
+        if not self._built:
+            return None
+        if self._watermark is None:
+            return datetime.datetime.min
+        return self._watermark - datetime.timedelta(seconds=settings.ENGINEER_READ_MODEL_LOOKBACK)
+
+    def load(self):
+        """
+        Read every profile the first time, then those changed since refresh_since().
+        """
+        return self.load_documents(read_profiles(self.projection, self.refresh_since()))
+
+    def reset(self):
+        with self._lock:
+            self._clear()
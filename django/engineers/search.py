@@ -0,0 +1,73 @@
+# engineers/search.py
+import re
+
+from .filters import filter_engineers
+from .serializers import ENGINEER_LIST_FIELDS
+from .text import tokenize
+
+# Score per query token: prefix hit, exact word hit, prefix hit on a name or city
+PREFIX_SCORE = 1
+EXACT_SCORE = 2
+NAME_PREFIX_SCORE = 3
+
+FACET_FIELDS = ('country', 'role_type', 'role_level')
+
+
+def _token_score(token):
+    starts_with_token = {'$eq': [{'$indexOfCP': ['$$term', token]}, 0]}
+    name_hits = {'$filter': {'input': {'$ifNull': ['$name_terms', []]}, 'as': 'term', 'cond': starts_with_token}}
+    return {'$add': [
+        {'$cond': [{'$in': [token, {'$ifNull': ['$search_terms', []]}]}, EXACT_SCORE, PREFIX_SCORE]},
+        {'$cond': [{'$gt': [{'$size': name_hits}, 0]}, NAME_PREFIX_SCORE, 0]},
+    ]}
+
+
+def _facet(field, unwind=False):
+    stages = [{'$unwind': f'${field}'}] if unwind else []
+    return stages + [
+        {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}},
+        {'$sort': {'count': -1, '_id': 1}},
+    ]
+
+
+def search_engineers(query, filters, offset, limit):
+    """
+    Rank profiles matching every word of `query` (as a prefix) and count facets in one aggregation.
+
+    Returns (engineers, total, facets): raw list documents for EngineerListSerializer,
+    the number of matches and {field: {value: count}} over all matches.
+    Raises ValueError for an empty page (limit < 1) or a negative offset, which MongoDB rejects.
+    """
+    if limit < 1 or offset < 0:
+        raise ValueError(f'Invalid page: offset={offset}, limit={limit}')
+    tokens = tokenize(query)
+    engineers = filter_engineers(filters)
+    if tokens:
+        engineers = engineers.filter(__raw__={
+            '$and': [{'search_terms': {'$regex': f'^{re.escape(token)}'}} for token in tokens]
+        })
+
+    if tokens:
+        ranking = [
+            {'$addFields': {'_score': {'$add': [_token_score(token) for token in tokens]}}},
+            {'$sort': {'_score': -1, '_id': 1}},
+        ]
+    else:
+        ranking = [{'$sort': {'_id': 1}}]
+
+    projection = {field: 1 for field in ENGINEER_LIST_FIELDS if field != 'id'}
+    pipeline = [{'$facet': {
+        'results': ranking + [{'$skip': offset}, {'$limit': limit}, {'$project': projection}],
+        'total': [{'$count': 'count'}],
+        'country': _facet('country'),
+        'role_type': _facet('role_type', unwind=True),
+        'role_level': _facet('role_level', unwind=True),
+    }}]
+
+    result = next(engineers.aggregate(pipeline), None) or {}
+    total = result['total'][0]['count'] if result.get('total') else 0
+    facets = {
+        field: {bucket['_id']: bucket['count'] for bucket in result.get(field, []) if bucket['_id'] is not None}
+        for field in FACET_FIELDS
+    }
+    return result.get('results', []), total, facets
@@ -1,9 +1,16 @@
 # engineers/serializers.py
 from rest_framework_mongoengine.serializers import DocumentSerializer
 from .models import Engineer
+from .hooks import engineer_saved
+from .stats import stat_snapshot
+from users.tokens import resolve_user
 from rest_framework import serializers
+from django.conf import settings
+from backend.instrumentation import TimedSerializerMixin, TimedListSerializer
+from backend.prefetch import prefetch_references
+from users.cache import user_cache
 
-class EngineerSerializer(DocumentSerializer):
+class EngineerSerializer(TimedSerializerMixin, DocumentSerializer):
     avatar = serializers.URLField(required=False, allow_blank=True)
     role_type = serializers.ListField(child=serializers.CharField())
     role_level = serializers.ListField(child=serializers.CharField())
@@ -15,11 +22,81 @@ class EngineerSerializer(DocumentSerializer):
 
     class Meta:
         model = Engineer
-        fields = '__all__'
-        read_only_fields = ['user']
+        # search_terms/name_terms are derived from the other fields in Engineer.clean()
+        exclude = ('search_terms', 'name_terms')
+        read_only_fields = ['user', 'version', 'updated_at']
+        list_serializer_class = TimedListSerializer
 
     def create(self, validated_data):
-        user = self.context['request'].user
+        user = resolve_user(self.context['request'].user)
         engineer = Engineer(user=user, **validated_data)
         engineer.save()
-        return engineer
\ No newline at end of file
+        engineer_saved(None, engineer)
+        return engineer
+
+    def update(self, instance, validated_data):
+        before = stat_snapshot(instance)
+        engineer = super().update(instance, validated_data)
+        engineer_saved(before, engineer)
+        return engineer
+
+
+def profile_data(engineer):
+    """
+    EngineerSerializer data for `engineer`, with its user reference resolved
+    through the user cache instead of a lazy dereference.
+    """
+    prefetch_references([engineer], 'user', cache=user_cache)
+    return EngineerSerializer(engineer).data
+
+
+def profiles_data(engineers):
+    """
+    profile_data() for many engineers, their user references resolved in one query.
+    """
+    engineers = prefetch_references(engineers, 'user', cache=user_cache)
+    return [EngineerSerializer(engineer).data for engineer in engineers]
+
+
+# Fields loaded for list pages; bio is cut down to an excerpt for the talent grid
+ENGINEER_LIST_FIELDS = (
+    'id', 'user', 'first_name', 'last_name', 'tag_line', 'city', 'country',
+    'avatar', 'avatar_variants', 'bio', 'search_status', 'role_type', 'role_level',
+)
+BIO_EXCERPT_LENGTH = 280
+
+
+class EngineerListSerializer(TimedSerializerMixin, serializers.BaseSerializer):
+    """
+    Read-only card representation for list pages.
+
+    Works on raw documents from `Engineer.objects.only(*ENGINEER_LIST_FIELDS).as_pymongo()`,
+    so no Engineer instances are built and no URL fields are re-validated.
+    `avatar` is the list-size thumbnail when one exists. Use EngineerSerializer
+    for the full profile.
+    """
+
+    class Meta:
+        list_serializer_class = TimedListSerializer
+
+    def to_representation(self, document):
+        bio = document.get('bio') or ''
+        if len(bio) > BIO_EXCERPT_LENGTH:
+            bio = bio[:BIO_EXCERPT_LENGTH].rstrip() + '…'
+        # Cards show the small thumbnail when the upload pipeline produced one
+        avatar = (document.get('avatar_variants') or {}).get(str(settings.AVATAR_LIST_VARIANT)) or document.get('avatar')
+        user = document.get('user')
+        return {
+            'id': str(document['_id']),
+            'user': str(user) if user is not None else None,
+            'first_name': document.get('first_name'),
+            'last_name': document.get('last_name'),
+            'tag_line': document.get('tag_line'),
+            'city': document.get('city'),
+            'country': document.get('country'),
+            'avatar': avatar,
+            'bio': bio,
+            'search_status': document.get('search_status'),
+            'role_type': document.get('role_type', []),
+            'role_level': document.get('role_level', []),
+        }
@@ -0,0 +1,125 @@
+# engineers/stats.py
+from django.conf import settings
+from django.core.cache import cache
+from .models import Engineer, EngineerStats
+
+STAT_FIELDS = ('country', 'role_type', 'role_level', 'search_status')
+ARRAY_FIELDS = ('role_type', 'role_level')
+STATS_ID = 'global'
+STATS_CACHE_KEY = 'engineers:stats'
+UNSET_KEY = '(none)'
+
+
+def stat_key(value):
+    """
+    Escape a field value for use as a key in the stats document.
+    """
+    if value in (None, ''):
+        return UNSET_KEY
+    key = str(value).replace('.', '．')
+    if key.startswith('$'):
+        key = '＄' + key[1:]
+    return key
+
+
+def _unstat_key(key):
+    key = key.replace('．', '.')
+    if key.startswith('＄'):
+        key = '$' + key[1:]
+    return key
+
+
+def stat_snapshot(engineer):
+    """
+    The values of `engineer` that the stats count, as {field: tuple of values}.
+    """
+    snapshot = {}
+    for field in STAT_FIELDS:
+        value = getattr(engineer, field, None)
+        snapshot[field] = tuple(value or ()) if field in ARRAY_FIELDS else (value,)
+    return snapshot
+
+
+def _add_increments(increments, snapshot, sign):
+    for field, values in snapshot.items():
+        for value in values:
+            path = f'{field}.{stat_key(value)}'
+            increments[path] = increments.get(path, 0) + sign
+
+
+def record_engineer_change(before, after):
+    """
+    Apply one profile write to the stats document with a single $inc.
+    `before`/`after` are stat_snapshot()s, None for a profile that did not / no longer exists.
+    """
+    increments = {}
+    if before is None:
+        increments['total'] = 1
+    else:
+        _add_increments(increments, before, -1)
+    if after is None:
+        increments['total'] = increments.get('total', 0) - 1
+    else:
+        _add_increments(increments, after, 1)
+
+    increments = {path: delta for path, delta in increments.items() if delta}
+    if not increments:
+        return
+    increments['version'] = 1
+
+    result = EngineerStats._get_collection().update_one(
+        {'_id': STATS_ID}, {'$inc': increments, '$currentDate': {'updated_at': True}}
+    )
+    if result.matched_count == 0:
+        # No stats yet: counting from zero would be wrong, build them from the collection
+        rebuild_engineer_stats()
+    cache.delete(STATS_CACHE_KEY)
+
+
+def _group(field):
+    stages = [{'$unwind': f'${field}'}] if field in ARRAY_FIELDS else []
+    return stages + [{'$group': {'_id': f'${field}', 'count': {'$sum': 1}}}]
+
+
+def rebuild_engineer_stats():
+    """
+    Recount everything from the engineers collection in one aggregation.
+    """
+    facets = {field: _group(field) for field in STAT_FIELDS}
+    facets['total'] = [{'$count': 'count'}]
+    result = next(Engineer._get_collection().aggregate([{'$facet': facets}]), None) or {}
+
+    document = {'total': result['total'][0]['count'] if result.get('total') else 0}
+    for field in STAT_FIELDS:
+        document[field] = {stat_key(bucket['_id']): bucket['count'] for bucket in result.get(field, [])}
+
+    EngineerStats._get_collection().update_one(
+        {'_id': STATS_ID},
+        {'$set': document, '$inc': {'version': 1}, '$currentDate': {'updated_at': True}},
+        upsert=True,
+    )
+    cache.delete(STATS_CACHE_KEY)
+    return document
+
+
+def get_engineer_stats():
+    """
+    The current stats as a plain dict, served from the cache when possible.
+    """
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        collection = EngineerStats._get_collection()
+        document = collection.find_one({'_id': STATS_ID})
+        if document is None:
+            rebuild_engineer_stats()
+            document = collection.find_one({'_id': STATS_ID}) or {}
+
+        stats = {'total': document.get('total', 0)}
+        for field in STAT_FIELDS:
+            stats[field] = {
+                _unstat_key(key): count for key, count in (document.get(field) or {}).items() if count > 0
+            }
+        stats['version'] = document.get('version', 0)
+        stats['updated_at'] = document.get('updated_at')
+        cache.set(STATS_CACHE_KEY, stats, settings.ENGINEER_STATS_CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,52 @@
+# engineers/storage.py
+import os
+import shutil
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from cloudinary.uploader import upload_large
+
+
+class CloudinaryStorage:
+    """
+    Uploads images to Cloudinary, streaming the file from disk in chunks.
+    """
+
+    def save(self, path, name):
+        result = upload_large(
+            path,
+            public_id=os.path.splitext(name)[0],
+            resource_type='image',
+            chunk_size=settings.AVATAR_UPLOAD_CHUNK_SIZE,
+        )
+        return {
+            'url': result.get('secure_url'),
+            'width': result.get('width'),
+            'height': result.get('height'),
+            'bytes': result.get('bytes'),
+            'format': result.get('format'),
+        }
+
+
+class LocalFileStorage:
+    """
+    Stores images under MEDIA_ROOT, for development and tests.
+    """
+
+    def save(self, path, name):
+        relative = os.path.join('avatars', name)
+        target = os.path.join(settings.MEDIA_ROOT, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(path, 'rb') as source, open(target, 'wb') as destination:
+            shutil.copyfileobj(source, destination, settings.AVATAR_UPLOAD_CHUNK_SIZE)
+        return {
+            'url': f"{settings.SITE_URL}{settings.MEDIA_URL}{relative.replace(os.sep, '/')}",
+            'width': None,
+            'height': None,
+            'bytes': os.path.getsize(target),
+            'format': os.path.splitext(name)[1].lstrip('.') or None,
+        }
+
+
+def get_avatar_storage():
+    return import_string(settings.AVATAR_STORAGE_BACKEND)()
@@ -1,3 +1,958 @@
-from django.test import TestCase
+# backend/engineers/tests.py
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from engineers.pagination import encode_cursor, decode_cursor, InvalidCursor, page_params, InvalidPage
+from engineers.cache import (get_engineer_count, invalidate_engineer_counts, cache_profile, get_cached_profile,
+                             acached_engineer_count, astore_engineer_count, acache_profile, aget_cached_profile)
+from engineers.serializers import EngineerListSerializer, BIO_EXCERPT_LENGTH, profile_data
+from engineers.uploads import validate_image, UploadRejected, get_upload_job, _set_job, JOB_DONE, JOB_PENDING
+from engineers.images import avatar_variants
+from engineers.text import tokenize, profile_terms
+from engineers.search import search_engineers
+from engineers.stats import stat_key, stat_snapshot, record_engineer_change, get_engineer_stats
+from engineers.models import Engineer, EngineerStats, UploadJob
+from engineers.export import export_record, ndjson_line, csv_lines
+from engineers.benchmark import percentile, summarize, filter_combinations
+from engineers.matching import EngineerMatrix, parse_match_query
+from engineers.bitmaps import FilterIndex
+from engineers.filters import engineer_filters, filter_query
+from backend.mongo import CommandStats, record_mongo_commands
+from backend.prefetch import prefetch_references
+from users.cache import user_cache
+from users.models import User
+from users.tokens import tokens_for_user
+from PIL import Image
+from unittest.mock import MagicMock, patch
+import datetime
+import io
+import json
+import os
+import tempfile
+import uuid
+
+class CursorPaginationTest(SimpleTestCase):
+    def test_cursor_round_trip(self):
+        """
+        Test that a cursor decodes back to the engineer id it was built from.
+        """
+        engineer_id = uuid.uuid4()
+        cursor = encode_cursor(engineer_id)
+        self.assertEqual(decode_cursor(cursor), engineer_id)
+
+    def test_empty_cursor_starts_from_first_page(self):
+        """
+        Test that an empty cursor means "start from the beginning".
+        """
+        self.assertIsNone(decode_cursor(''))
+        self.assertIsNone(decode_cursor(None))
+
+    def test_invalid_cursor(self):
+        """
+        Test that cursors we did not issue are rejected.
+        """
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('not-a-cursor')
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(encode_cursor('not-a-uuid'))
+
+    @override_settings(ENGINEER_PAGE_MAX_LIMIT=50)
+    def test_page_params(self):
+        """
+        Test that page and limit default, cap at ENGINEER_PAGE_MAX_LIMIT and reject empty or malformed pages.
+        """
+        self.assertEqual(page_params({}), (1, 10))
+        self.assertEqual(page_params({'page': '3', 'limit': '500'}), (3, 50))
+        for params in ({'limit': '0'}, {'page': '0'}, {'page': '-1'}, {'limit': 'ten'}):
+            with self.assertRaises(InvalidPage):
+                page_params(params)
+
+
+class EngineerCountCacheTest(SimpleTestCase):
+    def setUp(self):
+        invalidate_engineer_counts()
+        self.queryset = MagicMock()
+        self.queryset.count.return_value = 3
+
+    def test_filtered_count_is_cached(self):
+        """
+        Test that the same filters only hit MongoDB once.
+        """
+        filters = ('Germany', '', 'senior')
+        self.assertEqual(get_engineer_count(filters, self.queryset), (3, False))
+        self.assertEqual(get_engineer_count(filters, self.queryset), (3, False))
+        self.queryset.count.assert_called_once()
+
+    def test_invalidation_drops_cached_counts(self):
+        """
+        Test that a write forces the next count back to MongoDB.
+        """
+        filters = ('Germany', '', '')
+        get_engineer_count(filters, self.queryset)
+        invalidate_engineer_counts()
+        self.queryset.count.return_value = 4
+        self.assertEqual(get_engineer_count(filters, self.queryset), (4, False))
+        self.assertEqual(self.queryset.count.call_count, 2)
+
+    async def test_async_helpers_share_the_cache(self):
+        """
+        Test that counts stored by the async helpers are seen by the sync ones, and dropped with them.
+        """
+        filters = ('Germany', '', '')
+        self.assertIsNone(await acached_engineer_count(filters))
+        await astore_engineer_count(filters, 7)
+        self.assertEqual(get_engineer_count(filters, self.queryset), (7, False))
+        self.queryset.count.assert_not_called()
+        invalidate_engineer_counts()
+        self.assertIsNone(await acached_engineer_count(filters))
+
+    async def test_async_profile_entries(self):
+        """
+        Test that profiles cached from async views are read back by either helper.
+        """
+        engineer = Engineer(id=uuid.uuid4(), first_name='Ada', version=2)
+        entry = await acache_profile(engineer, {'first_name': 'Ada'})
+        self.assertEqual(entry['etag'], engineer.etag)
+        self.assertEqual(await aget_cached_profile(engineer.id), entry)
+        self.assertEqual(get_cached_profile(engineer.id), entry)
+
+
+class EngineerListSerializerTest(SimpleTestCase):
+    def test_raw_document_representation(self):
+        """
+        Test that raw list documents serialize to the card fields only.
+        """
+        engineer_id, user_id = uuid.uuid4(), uuid.uuid4()
+        document = {
+            '_id': engineer_id,
+            'user': user_id,
+            'first_name': 'Ada',
+            'last_name': 'Lovelace',
+            'country': 'United Kingdom',
+            'bio': 'x' * (BIO_EXCERPT_LENGTH + 50),
+            'role_type': ['contract_full_time'],
+        }
+        data = EngineerListSerializer([document], many=True).data[0]
+        self.assertEqual(data['id'], str(engineer_id))
+        self.assertEqual(data['user'], str(user_id))
+        self.assertEqual(data['role_type'], ['contract_full_time'])
+        self.assertEqual(data['role_level'], [])
+        self.assertIsNone(data['city'])
+        self.assertLessEqual(len(data['bio']), BIO_EXCERPT_LENGTH + 1)
+        self.assertNotIn('linkedIn', data)
+
+
+class AvatarValidationTest(SimpleTestCase):
+    def test_accepts_matching_image(self):
+        """
+        Test that a PNG with a PNG signature is accepted.
+        """
+        file = SimpleUploadedFile('avatar.png', b'\x89PNG\r\n\x1a\n' + b'\0' * 32, content_type='image/png')
+        self.assertEqual(validate_image(file), 'png')
+
+    def test_rejects_mismatched_content(self):
+        """
+        Test that a file whose bytes do not match its declared type is refused.
+        """
+        file = SimpleUploadedFile('avatar.png', b'<html></html>', content_type='image/png')
+        with self.assertRaises(UploadRejected):
+            validate_image(file)
+
+    def test_rejects_oversized_file(self):
+        """
+        Test that files over AVATAR_MAX_UPLOAD_SIZE never reach storage.
+        """
+        file = SimpleUploadedFile('avatar.jpg', b'\xff\xd8\xff' + b'\0' * 64, content_type='image/jpeg')
+        with self.settings(AVATAR_MAX_UPLOAD_SIZE=16):
+            with self.assertRaises(UploadRejected):
+                validate_image(file)
+
+
+class UploadImageViewTest(TestCase):
+    def setUp(self):
+        self.user = User(email=f'upload_view_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}')
+        self.url = reverse('upload-image')
+
+    def tearDown(self):
+        UploadJob.drop_collection()
+        User.drop_collection()
+
+    def png(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (8, 8), 'red').save(buffer, 'PNG')
+        return SimpleUploadedFile('avatar.png', buffer.getvalue(), content_type='image/png')
+
+    def test_upload_is_accepted_as_a_job(self):
+        """
+        Test that a valid image gets 202 with a pending job the uploader can poll.
+        """
+        with patch('engineers.uploads._get_executor') as get_executor:
+            response = self.client.post(self.url, {'file': self.png(), 'attach_to_profile': 'true'})
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertEqual(data['status'], JOB_PENDING)
+        self.assertEqual(data['status_url'], reverse('upload-image-status', kwargs={'job_id': data['job_id']}))
+
+        _, job_id, path, owner_id, attach_to_profile = get_executor.return_value.submit.call_args.args
+        self.addCleanup(os.remove, path)
+        self.assertEqual((job_id, owner_id, attach_to_profile), (data['job_id'], str(self.user.id), True))
+        response = self.client.get(data['status_url'])
+        self.assertEqual(response.json(), {'job_id': data['job_id'], 'status': JOB_PENDING})
+
+    def test_rejected_uploads(self):
+        """
+        Test that anonymous uploads get 401 and missing or mismatched files 400, without a job.
+        """
+        self.assertEqual(Client().post(self.url, {'file': self.png()}).status_code, 401)
+        response = self.client.post(self.url, {})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'No file provided'})
+        fake = SimpleUploadedFile('avatar.png', b'<html></html>', content_type='image/png')
+        response = self.client.post(self.url, {'file': fake})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+        self.assertEqual(UploadJob.objects.count(), 0)
+
+
+class UploadJobStatusTest(TestCase):
+    def setUp(self):
+        self.user = User(email=f'upload_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}')
+
+    def tearDown(self):
+        UploadJob.drop_collection()
+        User.drop_collection()
+
+    def test_status_is_shared_across_workers(self):
+        """
+        Test that job status is read from MongoDB, not from the process-local cache.
+        """
+        job_id = str(uuid.uuid4())
+        _set_job(job_id, JOB_DONE, str(self.user.id), result={'url': 'https://cdn.example.com/a.webp'})
+        cache.clear()  # another worker's cache never saw the job
+        response = self.client.get(reverse('upload-image-status', kwargs={'job_id': job_id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], JOB_DONE)
+        self.assertEqual(response.json()['url'], 'https://cdn.example.com/a.webp')
+
+    def test_jobs_are_private_and_expire(self):
+        """
+        Test that other users and expired jobs get 404.
+        """
+        job_id = str(uuid.uuid4())
+        _set_job(job_id, JOB_PENDING, str(uuid.uuid4()))
+        self.assertEqual(self.client.get(reverse('upload-image-status', kwargs={'job_id': job_id})).status_code, 404)
+        with self.settings(AVATAR_UPLOAD_JOB_TTL=-1):
+            _set_job(job_id, JOB_PENDING, str(self.user.id))
+        self.assertIsNone(get_upload_job(job_id))
+
+
+class AvatarVariantsTest(SimpleTestCase):
+    def test_variants_are_square_webp_without_metadata(self):
+        """
+        Test that every configured size is produced as a metadata-free WebP.
+        """
+        workdir = tempfile.mkdtemp()
+        source = os.path.join(workdir, 'source.jpg')
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera maker'
+        Image.new('RGB', (800, 600), 'red').save(source, 'JPEG', exif=exif)
+
+        with self.settings(AVATAR_VARIANT_SIZES=(64, 128)):
+            variants = avatar_variants(source, workdir)
+
+        self.assertEqual(sorted(variants), [64, 128])
+        for size, (path, width, height) in variants.items():
+            self.assertEqual((width, height), (size, size))
+            with Image.open(path) as image:
+                self.assertEqual(image.format, 'WEBP')
+                self.assertNotIn('exif', image.info)
+
+
+class SearchTermsTest(SimpleTestCase):
+    def test_tokenize_folds_case_and_accents(self):
+        """
+        Test that search tokens are lower-case and accent-free.
+        """
+        self.assertEqual(tokenize('José Müller, São Paulo'), ['jose', 'muller', 'sao', 'paulo'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_profile_terms_split_names_from_text(self):
+        """
+        Test that names and city feed the prefix-boost terms, the rest only search terms.
+        """
+        profile = {'first_name': 'Ada', 'last_name': 'Lovelace', 'city': 'London', 'bio': 'Angular expert'}
+        search_terms, name_terms = profile_terms(profile.get)
+        self.assertEqual(name_terms, ['ada', 'london', 'lovelace'])
+        self.assertIn('angular', search_terms)
+        self.assertNotIn('angular', name_terms)
+
+
+class EngineerStatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(email=f'stats_{uuid.uuid4()}@example.com', role='engineer')
+        self.user.set_password('securepassword123')
+        self.user.save()
+
+    def tearDown(self):
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def make_engineer(self, **fields):
+        engineer = Engineer(user=self.user, first_name='Ada', last_name='Lovelace', **fields)
+        engineer.save()
+        return engineer
+
+    def test_stat_keys_are_safe_field_names(self):
+        """
+        Test that values with dots or a leading dollar sign are escaped, and empty values grouped.
+        """
+        self.assertNotIn('.', stat_key('St. Lucia'))
+        self.assertFalse(stat_key('$x').startswith('$'))
+        self.assertEqual(stat_key(None), stat_key(''))
+
+    def test_incremental_updates_match_a_rebuild(self):
+        """
+        Test that $inc updates leave the same counts a full recount would.
+        """
+        first = self.make_engineer(country='Germany', role_level=['senior'])
+        stats = get_engineer_stats()
+        self.assertEqual(stats['total'], 1)
+        self.assertEqual(stats['country'], {'Germany': 1})
+
+        second = self.make_engineer(country='St. Lucia', role_level=['senior', 'c_level'])
+        record_engineer_change(None, stat_snapshot(second))
+        before = stat_snapshot(first)
+        first.country = 'Netherlands'
+        first.save()
+        record_engineer_change(before, stat_snapshot(first))
+
+        stats = get_engineer_stats()
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(stats['country'], {'Netherlands': 1, 'St. Lucia': 1})
+        self.assertEqual(stats['role_level'], {'senior': 2, 'c_level': 1})
+
+    def test_conditional_get(self):
+        """
+        Test that the stats endpoint answers 304 to a matching, weak, listed or `*` If-None-Match.
+        """
+        self.make_engineer(country='Germany')
+        url = reverse('engineer-stats')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+
+class EngineerConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(email=f'etag_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+        self.engineer = Engineer(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            linkedIn='https://linkedin.com/in/ada', github='https://github.com/ada',
+        )
+        self.engineer.save()
+        access = tokens_for_user(self.user).access_token
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.url = reverse('engineer-detail-update', kwargs={'engineer_id': self.engineer.id})
+
+    def tearDown(self):
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def test_if_none_match_returns_304(self):
+        """
+        Test that a client holding the current ETag gets 304 without a body.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.engineer.etag)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.engineer.etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class EngineerUpdateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(email=f'update_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+        self.engineer = Engineer(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            linkedIn='https://linkedin.com/in/ada', github='https://github.com/ada',
+        )
+        self.engineer.save()
+        access = tokens_for_user(self.user).access_token
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.url = reverse('engineer-detail-update', kwargs={'engineer_id': self.engineer.id})
+
+    def tearDown(self):
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def test_put_changes_the_etag(self):
+        """
+        Test that an update invalidates the cached profile and issues a new ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.put(self.url, data={'tag_line': 'Angular lead'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['tag_line'], 'Angular lead')
+
+    def test_stale_if_match_is_rejected(self):
+        """
+        Test that a write based on an outdated version fails with 412 and changes nothing.
+        """
+        stale_etag = self.client.get(self.url)['ETag']
+        response = self.client.put(self.url, data={'city': 'London'}, content_type='application/json',
+                                   HTTP_IF_MATCH=stale_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], f'"{self.engineer.id}-{self.engineer.version + 1}"')
+
+        response = self.client.put(self.url, data={'city': 'Paris'}, content_type='application/json',
+                                   HTTP_IF_MATCH=stale_etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(Engineer.objects.get(id=self.engineer.id).city, 'London')
+
+    def test_if_match_for_another_profile_is_rejected(self):
+        """
+        Test that an ETag issued for another profile fails with 412 even when the versions agree.
+        """
+        other_etag = f'"{uuid.uuid4()}-{self.engineer.version}"'
+        for data in ({'city': 'Paris'}, {'tag_line': 'Angular lead'}):
+            response = self.client.put(self.url, data=data, content_type='application/json',
+                                       HTTP_IF_MATCH=other_etag)
+            self.assertEqual(response.status_code, 412)
+        engineer = Engineer.objects.get(id=self.engineer.id)
+        self.assertEqual((engineer.city, engineer.version), (self.engineer.city, self.engineer.version))
+
+    def test_invalid_choice_is_rejected(self):
+        """
+        Test that values the model rejects get 400 and leave the stored profile valid.
+        """
+        response = self.client.put(self.url, data={'role_type': ['bogus']}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('role_type', response.json())
+        engineer = Engineer.objects.get(id=self.engineer.id)
+        self.assertEqual(engineer.role_type, [])
+        engineer.validate()
+
+    def test_search_terms_follow_the_update(self):
+        """
+        Test that search terms are rebuilt from the changed and the stored fields in the same write.
+        """
+        response = self.client.put(self.url, data={'city': 'Lisbon'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        engineer = Engineer.objects.get(id=self.engineer.id)
+        self.assertIn('lisbon', engineer.search_terms)
+        self.assertIn('lovelace', engineer.name_terms)
+        self.assertEqual(engineer.version, self.engineer.version + 1)
+
+
+class ReferencePrefetchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.users = []
+        for i in range(6):
+            user = User(email=f'prefetch_{i}_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+            user.set_password('securepassword123')
+            user.save()
+            Engineer(
+                user=user, first_name=f'Ada{i}', last_name='Lovelace',
+                linkedIn='https://linkedin.com/in/ada', github='https://github.com/ada',
+            ).save()
+            self.users.append(user)
+        access = tokens_for_user(self.users[0]).access_token
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def tearDown(self):
+        user_cache.clear()
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def test_one_query_resolves_every_reference(self):
+        """
+        Test that prefetching loads all referenced users in one query and wires them back.
+        """
+        engineers = list(Engineer.objects())
+        with record_mongo_commands() as mongo:
+            prefetch_references(engineers, 'user')
+            emails = {engineer.user.email for engineer in engineers}
+        self.assertEqual(mongo.count, 1)
+        self.assertEqual(emails, {user.email for user in self.users})
+        self.assertFalse(engineers[0]._get_changed_fields())
+
+    def test_profile_serialization_uses_the_user_cache(self):
+        """
+        Test that a cached user is not fetched again to serialize a profile.
+        """
+        engineer = Engineer.objects.first()
+        user_cache.set(engineer._data['user'].id, User.objects.get(id=engineer._data['user'].id))
+        with record_mongo_commands() as mongo:
+            data = profile_data(engineer)
+        self.assertEqual(mongo.count, 0)
+        self.assertEqual(data['user'], str(engineer.user.id))
+
+    def test_list_round_trips_do_not_grow_with_page_size(self):
+        """
+        Test that a list page costs the same number of MongoDB commands for 2 or 6 engineers.
+        """
+        url = reverse('engineers-list-create')
+        self.client.get(url, {'limit': 1})  # warm per-process caches
+        counts = []
+        for limit in (2, 6):
+            with record_mongo_commands() as mongo:
+                response = self.client.get(url, {'limit': limit})
+            self.assertEqual(len(response.json()['engineers']), limit)
+            counts.append(mongo.count)
+        self.assertEqual(counts[0], counts[1])
+
+
+class EngineerListPageTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(email=f'pages_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+        Engineer(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            linkedIn='https://linkedin.com/in/ada', github='https://github.com/ada',
+        ).save()
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}')
+
+    def tearDown(self):
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def test_empty_pages_are_rejected(self):
+        """
+        Test that limit=0 and page=0 get 400 in both page and cursor mode instead of failing.
+        """
+        url = reverse('engineers-list-create')
+        for params in ({'limit': 0}, {'limit': 0, 'cursor': ''}, {'page': 0}):
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+class EngineerSearchViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(email=f'search_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+        Engineer(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            linkedIn='https://linkedin.com/in/ada', github='https://github.com/ada',
+        ).save()
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}')
+
+    def tearDown(self):
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def test_search_rejects_bad_pages(self):
+        """
+        Test that search answers empty, negative or non-integer pages with 400.
+        """
+        url = reverse('engineer-search')
+        for params in ({'q': 'ada', 'limit': 0}, {'q': 'ada', 'page': 0}, {'q': 'ada', 'limit': 'ten'}):
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+        self.assertEqual(self.client.get(url, {'q': 'ada', 'limit': 2}).status_code, 200)
+        with self.assertRaises(ValueError):
+            search_engineers('ada', ('', '', ''), -10, 10)
+
+
+class EngineerBatchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.engineers = []
+        for i in range(3):
+            user = User(email=f'batch_{i}_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+            user.set_password('securepassword123')
+            user.save()
+            engineer = Engineer(
+                user=user, first_name=f'Grace{i}', last_name='Hopper',
+                linkedIn='https://linkedin.com/in/grace', github='https://github.com/grace',
+            )
+            engineer.save()
+            self.engineers.append(engineer)
+        recruiter = User(email=f'batch_recruiter_{uuid.uuid4()}@example.com', role='recruiter', is_verified=True)
+        recruiter.set_password('securepassword123')
+        recruiter.save()
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(recruiter).access_token}')
+        self.engineer_client = Client(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(user).access_token}')
+        self.url = reverse('engineer-batch')
+
+    def tearDown(self):
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def post(self, ids):
+        return self.client.post(self.url, data={'ids': ids}, content_type='application/json')
+
+    def test_profiles_come_back_in_request_order(self):
+        """
+        Test that profiles keep the requested order, duplicates collapse and unknown ids are reported.
+        """
+        first, second, third = (str(engineer.id) for engineer in self.engineers)
+        unknown = str(uuid.uuid4())
+        response = self.post([third, unknown, first, third])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([profile['id'] for profile in response.json()['engineers']], [third, first])
+        self.assertEqual(response.json()['missing'], [unknown])
+        self.assertNotIn('search_terms', response.json()['engineers'][0])
+
+    def test_cached_profiles_skip_mongodb(self):
+        """
+        Test that a repeated batch is answered from the profile cache.
+        """
+        ids = [str(engineer.id) for engineer in self.engineers]
+        self.assertEqual(len(self.post(ids).json()['engineers']), 3)
+        Engineer._get_collection().delete_many({})  # bypasses invalidation, so only the cache can answer
+        response = self.post(ids)
+        self.assertEqual(len(response.json()['engineers']), 3)
+        self.assertEqual(response.json()['missing'], [])
+
+    @override_settings(ENGINEER_BATCH_MAX_IDS=2)
+    def test_invalid_batches_are_rejected(self):
+        """
+        Test that empty, oversized or malformed id lists, or a body that is not an object, get 400.
+        """
+        for ids in ([], [str(uuid.uuid4()) for _ in range(3)], ['not-a-uuid']):
+            self.assertEqual(self.post(ids).status_code, 400)
+        response = self.client.post(self.url, data=[str(self.engineers[0].id)], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_engineers_cannot_bulk_read_profiles(self):
+        """
+        Test that the batch endpoint is for recruiters only.
+        """
+        response = self.engineer_client.post(self.url, data={'ids': [str(self.engineers[0].id)]},
+                                             content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ImportEngineersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(email=f'import_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+        self.engineer_id = uuid.uuid4()
+
+    def tearDown(self):
+        Engineer.drop_collection()
+        EngineerStats.drop_collection()
+        User.drop_collection()
+
+    def record(self, **fields):
+        return {'id': str(self.engineer_id), 'user': str(self.user.id), 'first_name': 'Ada', 'last_name': 'Lovelace',
+                'linkedIn': 'https://linkedin.com/in/ada', 'github': 'https://github.com/ada',
+                'role_type': ['contract_full_time'], 'role_level': ['senior'], **fields}
+
+    def run_import(self, *records):
+        handle, path = tempfile.mkstemp(suffix='.ndjson')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(record) + '\n' for record in records)
+        stderr = io.StringIO()
+        call_command('import_engineers', path, stderr=stderr)
+        return stderr.getvalue()
+
+    def test_valid_and_invalid_lines(self):
+        """
+        Test that valid lines are imported and lines the model rejects are reported by line number.
+        """
+        bad = self.record(id=str(uuid.uuid4()), role_type=['bogus'])
+        output = self.run_import(self.record(), bad)
+        self.assertIn('Line 2', output)
+        self.assertIn('1 rejected', output)
+        engineer = Engineer.objects.get(id=self.engineer_id)
+        engineer.validate()
+        self.assertEqual(engineer.version, 1)
+        self.assertIn('lovelace', engineer.search_terms)
+        self.assertEqual(Engineer.objects.count(), 1)
+        self.assertEqual(get_engineer_stats()['total'], 1)
+
+    def test_reimport_replaces_and_invalidates(self):
+        """
+        Test that re-importing a profile replaces it, bumps its version and drops its cached copy.
+        """
+        self.run_import(self.record(tag_line='Before'))
+        engineer = Engineer.objects.get(id=self.engineer_id)
+        cache_profile(engineer, {'tag_line': 'Before'})
+        self.run_import(self.record(tag_line='After'))
+        engineer = Engineer.objects.get(id=self.engineer_id)
+        self.assertEqual((engineer.tag_line, engineer.version), ('After', 2))
+        self.assertIsNone(get_cached_profile(self.engineer_id))
+        self.assertEqual(Engineer.objects.count(), 1)
+
+
+class NdjsonExportTest(SimpleTestCase):
+    def test_record_is_one_json_line_without_derived_fields(self):
+        """
+        Test that exported records are single JSON lines keyed by 'id' with derived fields dropped.
+        """
+        engineer_id, user_id = uuid.uuid4(), uuid.uuid4()
+        document = {'_id': engineer_id, 'user': user_id, 'first_name': 'Ada', 'search_terms': ['ada']}
+        line = ndjson_line(export_record(document))
+        self.assertTrue(line.endswith('\n'))
+        self.assertEqual(line.count('\n'), 1)
+        record = json.loads(line)
+        self.assertEqual(record, {'id': str(engineer_id), 'user': str(user_id), 'first_name': 'Ada'})
+
+    def test_csv_lines_flatten_lists_and_neutralize_formulas(self):
+        """
+        Test that CSV rows join list values and never start a cell with a formula.
+        """
+        record = {'id': 'abc', 'first_name': '=HYPERLINK("x")', 'role_level': ['senior', 'c_level']}
+        header, row = list(csv_lines([record]))
+        self.assertTrue(header.startswith('id,user,first_name'))
+        self.assertIn('senior;c_level', row)
+        self.assertIn("'=HYPERLINK", row)
+
+
+class BenchmarkReportTest(SimpleTestCase):
+    def test_percentiles_use_nearest_rank(self):
+        """
+        Test that percentiles pick the nearest-rank sample.
+        """
+        latencies = [float(n) for n in range(1, 101)]
+        self.assertEqual(percentile(latencies, 50), 50.0)
+        self.assertEqual(percentile(latencies, 95), 95.0)
+        self.assertEqual(percentile(latencies, 99), 99.0)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summary_counts_statuses_and_mongo_ops(self):
+        """
+        Test that a summary aggregates status codes, server errors and Mongo commands.
+        """
+        first, second = CommandStats(), CommandStats()
+        first.add('find', 1500)
+        second.add('find', 500)
+        second.add('count', 1000)
+        summary = summarize([(2.0, 200, first), (4.0, 500, second)], wall_time=0.5)
+        self.assertEqual(summary['status_codes'], {'200': 1, '500': 1})
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['throughput_rps'], 4.0)
+        self.assertEqual(summary['mongo']['ops_per_request'], 1.5)
+        self.assertEqual(summary['mongo']['time_ms_per_request'], 1.5)
+        self.assertEqual(summary['mongo']['by_command'], {'find': 2, 'count': 1})
+
+    def test_every_filter_combination_is_covered(self):
+        """
+        Test that the list scenarios cover all seven filter combinations.
+        """
+        self.assertEqual(len(filter_combinations()), 7)
+
+
+@override_settings(ENGINEER_MATCH_SKILLS=['angular', 'python', 'django'], ENGINEER_MATCH_REFRESH_INTERVAL=3600)
+class EngineerMatchTest(SimpleTestCase):
+    def matrix(self, *profiles):
+        matrix = EngineerMatrix()
+        matrix.load_documents(profiles)
+        return matrix
+
+    def test_top_matches_rank_by_weighted_fit(self):
+        """
+        Test that profiles come back best match first and non-matching ones are left out.
+        """
+        full, partial, none = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        matrix = self.matrix(
+            {'_id': partial, 'country': 'Germany', 'role_level': ['mid_level'], 'search_terms': ['python']},
+            {'_id': full, 'country': 'Germany', 'role_level': ['senior'], 'search_terms': ['angular', 'python']},
+            {'_id': none, 'country': 'Spain', 'role_level': ['junior'], 'search_terms': ['java']},
+        )
+        criteria = {'country': ['Germany'], 'role_level': ['senior'], 'skills': ['Angular', 'python', 'cobol']}
+        weights = {'country': 1, 'role_level': 2, 'skills': 3}
+        ids, scores, matched, unknown = matrix.top_matches(criteria, weights, 10)
+        self.assertEqual(ids, [full, partial])
+        self.assertEqual(matched, 2)
+        self.assertAlmostEqual(scores[0], (1 + 2 + 3 * 2 / 3) / 6, places=5)
+        self.assertAlmostEqual(scores[1], (1 + 3 * 1 / 3) / 6, places=5)
+        self.assertEqual(unknown, ['cobol'])
+
+    def test_top_k_and_in_place_updates(self):
+        """
+        Test that only k results are returned and a re-applied profile moves to its new score.
+        """
+        first, second = uuid.uuid4(), uuid.uuid4()
+        matrix = self.matrix({'_id': first, 'country': 'Germany'}, {'_id': second, 'country': 'France'})
+        self.assertEqual(matrix.top_matches({'country': ['Germany', 'France']}, {'country': 1}, 1)[0], [first])
+
+        moved = Engineer(id=first, country='Spain')
+        matrix.apply(moved)
+        ids, _, matched, _ = matrix.top_matches({'country': ['Germany', 'France']}, {'country': 1}, 10)
+        self.assertEqual((ids, matched), ([second], 1))
+
+    def test_query_validation(self):
+        """
+        Test that malformed match requests are rejected with a message.
+        """
+        criteria, weights, limit = parse_match_query({'criteria': {'country': 'Germany,France'}, 'limit': 5000})
+        self.assertEqual(criteria, {'country': ['Germany', 'France']})
+        self.assertEqual(weights, {'country': 1.0})
+        self.assertEqual(limit, 100)
+        for body in ({}, [], {'criteria': {'salary': ['1']}}, {'criteria': {'role_level': ['wizard']}},
+                     {'criteria': {'country': ['Germany']}, 'weights': {'country': -1}},
+                     {'criteria': {'country': ['Germany']}, 'weights': {'country': 'nan'}},
+                     {'criteria': {'country': ['Germany']}, 'weights': {'country': 'inf'}}):
+            with self.assertRaises(ValueError):
+                parse_match_query(body)
+
+
+@override_settings(ENGINEER_FILTER_INDEX_REFRESH_INTERVAL=3600, ENGINEER_FILTER_INDEX_MAX_STALENESS=3600)
+class FilterIndexTest(SimpleTestCase):
+    def index(self, *profiles):
+        index = FilterIndex()
+        index.load_documents(profiles)
+        return index
+
+    def profiles(self):
+        ids = sorted((uuid.uuid4() for _ in range(4)), key=lambda engineer_id: engineer_id.bytes)
+        return ids, [
+            {'_id': ids[3], 'country': 'Germany', 'role_type': ['contract_full_time'], 'role_level': ['senior']},
+            {'_id': ids[0], 'country': 'Germany', 'role_type': ['employee_full_time'], 'role_level': ['principal_staff']},
+            {'_id': ids[2], 'country': 'France', 'role_type': ['contract_full_time'], 'role_level': ['senior']},
+            {'_id': ids[1], 'country': 'Germany', 'role_type': ['contract_full_time'], 'role_level': ['junior']},
+        ]
+
+    def test_filters_or_within_and_across(self):
+        """
+        Test that values of one filter are OR-ed, filters AND-ed, and pages come in _id order.
+        """
+        ids, profiles = self.profiles()
+        index = self.index(*profiles)
+        page = index.query(('Germany', '', 'principal_staff,senior'))
+        self.assertEqual((page.ids, page.total), ([ids[0], ids[3]], 2))
+        page = index.query(('', 'contract_full_time', 'junior,senior'), offset=1, limit=1)
+        self.assertEqual((page.ids, page.total), ([ids[2]], 3))
+        self.assertEqual(index.query(('Spain', '', '')).total, 0)
+
+    def test_cursor_pages_and_updates(self):
+        """
+        Test that cursor pages resume after the given id and a re-applied profile changes its matches.
+        """
+        ids, profiles = self.profiles()
+        index = self.index(*profiles)
+        first = index.query(('', '', ''), limit=2, cursor=True)
+        self.assertEqual((first.ids, first.has_more), (ids[:2], True))
+        last = index.query(('', '', ''), limit=2, after_id=first.ids[-1], cursor=True)
+        self.assertEqual((last.ids, last.has_more), (ids[2:], False))
+
+        index.apply(Engineer(id=ids[2], country='Germany', role_type=['contract_full_time'], role_level=['senior']))
+        self.assertEqual(index.query(('Germany', '', 'senior')).ids, [ids[2], ids[3]])
+
+    def test_empty_pages_are_refused(self):
+        """
+        Test that a zero limit or negative offset raises instead of returning a page without ids.
+        """
+        _, profiles = self.profiles()
+        index = self.index(*profiles)
+        for options in ({'limit': 0, 'cursor': True}, {'limit': 0}, {'offset': -10}):
+            with self.assertRaises(ValueError):
+                index.query(('', '', ''), **options)
+
+    def test_stale_index_defers_to_query_path(self):
+        """
+        Test that an index not refreshed within ENGINEER_FILTER_INDEX_MAX_STALENESS answers nothing.
+        """
+        _, profiles = self.profiles()
+        index = self.index(*profiles)
+        self.assertIsNotNone(index.query(('Germany', '', '')))
+        with override_settings(ENGINEER_FILTER_INDEX_MAX_STALENESS=0):
+            self.assertIsNone(index.query(('Germany', '', '')))
+
+    def test_filter_params_are_normalized(self):
+        """
+        Test that multi-select filter values are trimmed, deduplicated and sorted.
+        """
+        filters = engineer_filters({'country': 'Germany', 'roleLevel': 'senior, principal_staff,senior'})
+        self.assertEqual(filters, ('Germany', '', 'principal_staff,senior'))
+
+    def test_country_names_keep_their_commas(self):
+        """
+        Test that a country name containing a comma stays one filter value.
+        """
+        country = 'Saint Helena, Ascension and Tristan da Cunha'
+        filters = engineer_filters({'country': country, 'roleType': 'contract_full_time'})
+        self.assertEqual(filters, (country, 'contract_full_time', ''))
+        self.assertEqual(filter_query(filters), {'country': country, 'role_type': 'contract_full_time'})
+        ids, profiles = self.profiles()
+        index = self.index(*profiles, {'_id': uuid.uuid4(), 'country': country, 'role_type': ['contract_full_time']})
+        self.assertEqual(index.query(filters).total, 1)
+
+    def test_filter_query(self):
+        """
+        Test that single values match directly and multi-select values with $in.
+        """
+        self.assertEqual(filter_query(('', '', '')), {})
+        self.assertEqual(filter_query(('Germany', '', 'principal_staff,senior')),
+                         {'country': 'Germany', 'role_level': {'$in': ['principal_staff', 'senior']}})
+
+
+@override_settings(ENGINEER_READ_MODEL_LOOKBACK=60)
+class ReadModelRefreshTest(TestCase):
+    def tearDown(self):
+        Engineer.drop_collection()
+
+    def insert(self, updated_at, **fields):
+        engineer_id = uuid.uuid4()
+        Engineer._get_collection().insert_one({'_id': engineer_id, 'updated_at': updated_at, **fields})
+        return engineer_id
+
+    def test_filter_index_picks_up_late_commits(self):
+        """
+        Test that a profile stamped before the newest one already read is still indexed on refresh.
+        """
+        now = datetime.datetime.utcnow().replace(microsecond=0)
+        first = self.insert(now, country='Germany')
+        index = FilterIndex()
+        index.load()
+        # Stamped earlier by another worker's clock, committed after the first load
+        late = self.insert(now - datetime.timedelta(seconds=10), country='Germany')
+        index.load()
+        self.assertEqual(index.query(('Germany', '', ''), limit=10).total, 2)
+        self.assertEqual(set(index.query(('Germany', '', ''), limit=10).ids), {first, late})
+
+    def test_match_matrix_picks_up_late_commits(self):
+        """
+        Test that the match matrix re-reads behind its watermark the same way.
+        """
+        now = datetime.datetime.utcnow().replace(microsecond=0)
+        self.insert(now, country='Germany')
+        matrix = EngineerMatrix()
+        matrix.load()
+        late = self.insert(now - datetime.timedelta(seconds=10), country='France')
+        matrix.load()
+        self.assertEqual(matrix.top_matches({'country': ['France']}, {'country': 1}, 10)[0], [late])
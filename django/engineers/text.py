@@ -0,0 +1,34 @@
+# engineers/text.py
+import re
+import unicodedata
+
+# Profile fields matched by search; names and city also get prefix boosts
+SEARCH_FIELDS = ('first_name', 'last_name', 'city', 'country', 'tag_line', 'bio')
+NAME_FIELDS = ('first_name', 'last_name', 'city')
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """
+    Lower-case, accent-folded word tokens of `text`.
+    """
+    if not text:
+        return []
+    folded = unicodedata.normalize('NFKD', text)
+    folded = ''.join(c for c in folded if not unicodedata.combining(c)).lower()
+    return _WORD.findall(folded)
+
+
+def profile_terms(get):
+    """
+    Build (search_terms, name_terms) for a profile, where `get(field)` reads a field
+    from either an Engineer document or a raw MongoDB dict.
+    """
+    search_terms, name_terms = set(), set()
+    for field in SEARCH_FIELDS:
+        tokens = tokenize(get(field))
+        search_terms.update(tokens)
+        if field in NAME_FIELDS:
+            name_terms.update(tokens)
+    return sorted(search_terms), sorted(name_terms)
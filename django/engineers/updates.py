@@ -0,0 +1,133 @@
+# engineers/updates.py
+import datetime
+
+from django.utils.http import parse_etags
+from mongoengine.errors import ValidationError
+from .hooks import engineer_saved
+from .models import Engineer
+from .stats import stat_snapshot
+from .text import SEARCH_FIELDS, profile_terms
+
+
+# Re-reads allowed when concurrent writes keep moving a profile under an unconditional update
+UPDATE_ATTEMPTS = 3
+
+
+class VersionConflict(Exception):
+    pass
+
+
+def update_precondition(request):
+    """
+    What the client's write is based on, as (version, etag): an ETag we issued
+    ("<id>-<version>") from If-Match with its version, or a `version` field in
+    the body with no ETag. (None, None) means the client did not ask for a precondition.
+    """
+    header = request.META.get('HTTP_IF_MATCH')
+    if header:
+        etags = [etag for etag in parse_etags(header) if etag != '*']
+        if not etags:
+            return None, None
+        try:
+            return int(etags[0].strip('"').rsplit('-', 1)[1]), etags[0]
+        except (IndexError, ValueError):
+            raise VersionConflict(header)
+    if 'version' in request.data:
+        try:
+            return int(request.data['version']), None
+        except (TypeError, ValueError):
+            raise VersionConflict(request.data['version'])
+    return None, None
+
+
+def _precondition_holds(engineer, version, etag):
+    # An ETag is compared whole, so one issued for another profile never matches
+    if etag is not None:
+        return engineer.etag == etag
+    return version is None or (engineer.version or 0) == version
+
+
+def validate_changes(validated_data):
+    """
+    Check each changed field against the Engineer model (choices, URL formats)
+    the way Engineer.validate() would; the $set write never runs it.
+    Raises ValidationError whose `errors` map field names to messages.
+    """
+    errors = {}
+    for field, value in validated_data.items():
+        if value is None:
+            continue
+        try:
+            Engineer._fields[field].validate(value)
+        except ValidationError as e:
+            errors[field] = e
+    if errors:
+        raise ValidationError('Invalid profile update', errors=errors)
+
+
+def update_engineer(lookup, validated_data, version=None, etag=None):
+    """
+    Apply `validated_data` to the profile matching `lookup` with a single
+    findAndModify that $sets only those fields (plus the derived search terms)
+    and bumps the version.
+
+    Returns the updated Engineer, built from the returned pre-image, or None when
+    no profile matches. Raises ValidationError for values the model rejects and
+    VersionConflict when the stored profile no longer has `version`, or its
+    ETag differs from `etag` (as from update_precondition()).
+    """
+    validate_changes(validated_data)
+    if not validated_data:
+        engineer = Engineer.objects(**lookup).first()
+        if engineer is not None and not _precondition_holds(engineer, version, etag):
+            raise VersionConflict(version)
+        return engineer
+
+    # Search tokens depend on several fields; when one changes they are rebuilt
+    # from the stored values of the others, so the write is pinned to the version
+    # read. An ETag precondition also needs the stored profile to compare against.
+    needs_terms = any(field in validated_data for field in SEARCH_FIELDS)
+    for _ in range(UPDATE_ATTEMPTS):
+        expected = version
+        updates = {f'set__{field}': value for field, value in validated_data.items()}
+        if needs_terms or etag is not None:
+            current = Engineer.objects(**lookup).only('version', *SEARCH_FIELDS).first()
+            if current is None:
+                return None
+            if not _precondition_holds(current, version, etag):
+                raise VersionConflict(version)
+            expected = current.version or 0
+        if needs_terms:
+            search_terms, name_terms = profile_terms(
+                lambda field: validated_data[field] if field in validated_data else getattr(current, field)
+            )
+            updates.update(set__search_terms=search_terms, set__name_terms=name_terms)
+
+        query = dict(lookup)
+        if expected is not None:
+            # Profiles saved before versioning have no version field; treat them as 0
+            query['version__in'] = [expected, None] if expected == 0 else [expected]
+
+        now = datetime.datetime.utcnow()
+        before = Engineer.objects(**query).modify(new=False, inc__version=1, set__updated_at=now, **updates)
+        if before is not None:
+            break
+        if Engineer.objects(**lookup).only('id').first() is None:
+            return None
+        if version is not None or not needs_terms:
+            raise VersionConflict(version)
+        # Another write landed between the read and ours; rebuild the terms from it
+    else:
+        raise VersionConflict(version)
+
+    snapshot = stat_snapshot(before)
+    engineer = before
+    for field, value in validated_data.items():
+        setattr(engineer, field, value)
+    if needs_terms:
+        engineer.search_terms, engineer.name_terms = search_terms, name_terms
+    engineer.version = (before.version or 0) + 1
+    engineer.updated_at = now
+
+    engineer_saved(snapshot, engineer)
+    return engineer
@@ -0,0 +1,161 @@
+# engineers/uploads.py
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from .cache import invalidate_profile
+from .images import avatar_variants
+from .models import Engineer, UploadJob
+from .storage import get_avatar_storage
+
+logger = logging.getLogger(__name__)
+
+# Accepted image types: content type -> (file extension, magic byte prefixes)
+ALLOWED_IMAGE_TYPES = {
+    'image/jpeg': ('jpg', (b'\xff\xd8\xff',)),
+    'image/png': ('png', (b'\x89PNG\r\n\x1a\n',)),
+    'image/gif': ('gif', (b'GIF87a', b'GIF89a')),
+    'image/webp': ('webp', (b'RIFF',)),
+}
+
+JOB_PENDING = 'pending'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class UploadRejected(ValueError):
+    pass
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.AVATAR_UPLOAD_WORKERS, thread_name_prefix='avatar-upload'
+            )
+    return _executor
+
+
+def validate_image(file):
+    """
+    Check size, declared type and magic bytes before anything is sent to storage.
+    Returns the file extension matching the image type.
+    """
+    if file.size > settings.AVATAR_MAX_UPLOAD_SIZE:
+        raise UploadRejected(f'File too large, the limit is {settings.AVATAR_MAX_UPLOAD_SIZE // (1024 * 1024)} MB')
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise UploadRejected(f'Unsupported file type {file.content_type}')
+
+    extension, signatures = ALLOWED_IMAGE_TYPES[file.content_type]
+    file.seek(0)
+    head = file.read(12)
+    file.seek(0)
+    if not head.startswith(signatures) or (extension == 'webp' and head[8:12] != b'WEBP'):
+        raise UploadRejected('File content does not match its type')
+    return extension
+
+
+def spool_upload(file):
+    """
+    Copy the uploaded file chunk by chunk to a temp file the worker owns,
+    since Django removes its own temp file when the request ends.
+    """
+    handle, path = tempfile.mkstemp(prefix='avatar-', dir=settings.AVATAR_UPLOAD_TMP_DIR)
+    with os.fdopen(handle, 'wb') as spooled:
+        for chunk in file.chunks():
+            spooled.write(chunk)
+    return path
+
+
+def get_upload_job(job_id):
+    """
+    {'status', 'owner', and 'result' or 'error' once finished} for `job_id`, or None.
+    """
+    job = UploadJob.objects(id=job_id, expires_at__gt=datetime.datetime.utcnow()).first()
+    if job is None:
+        return None
+    data = {'status': job.status, 'owner': job.owner}
+    if job.result:
+        data['result'] = job.result
+    if job.error:
+        data['error'] = job.error
+    return data
+
+
+def _set_job(job_id, status, owner_id, result=None, error=None):
+    expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=settings.AVATAR_UPLOAD_JOB_TTL)
+    UploadJob(id=job_id, owner=owner_id, status=status, result=result or {}, error=error,
+              expires_at=expires_at).save()
+
+
+def submit_upload(path, owner_id, attach_to_profile=False):
+    """
+    Process and store the spooled file in the background and return the job id to poll.
+    """
+    job_id = str(uuid.uuid4())
+    _set_job(job_id, JOB_PENDING, str(owner_id))
+    _get_executor().submit(_run_upload, job_id, path, str(owner_id), attach_to_profile)
+    return job_id
+
+
+def store_avatar(path):
+    """
+    Normalize the image into thumbnail variants and store each one.
+    The largest variant becomes the avatar itself.
+    """
+    storage = get_avatar_storage()
+    basename = uuid.uuid4().hex
+    workdir = tempfile.mkdtemp(prefix='avatar-', dir=settings.AVATAR_UPLOAD_TMP_DIR)
+    try:
+        urls, total_bytes = {}, 0
+        variants = avatar_variants(path, workdir)
+        for size, (variant_path, width, height) in variants.items():
+            stored = storage.save(variant_path, f'{basename}_{size}.webp')
+            urls[str(size)] = stored['url']
+            total_bytes += stored['bytes'] or 0
+
+        largest = max(variants)
+        return {
+            'url': urls[str(largest)],
+            'variants': urls,
+            'width': variants[largest][1],
+            'height': variants[largest][2],
+            'bytes': total_bytes,
+            'format': 'webp',
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_upload(job_id, path, owner_id, attach_to_profile):
+    try:
+        result = store_avatar(path)
+        if attach_to_profile:
+            engineer = Engineer.objects(user=uuid.UUID(owner_id)).modify(
+                new=True,
+                set__avatar=result['url'],
+                set__avatar_variants=result['variants'],
+                set__updated_at=datetime.datetime.utcnow(),
+                inc__version=1,
+            )
+            if engineer:
+                invalidate_profile(engineer.id)
+        _set_job(job_id, JOB_DONE, owner_id, result=result)
+    except Exception as e:
+        logger.error(f"Avatar upload {job_id} failed: {e}")
+        _set_job(job_id, JOB_FAILED, owner_id, error='Upload failed')
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,10 +1,30 @@
+from django.conf import settings
 from django.urls import path
-from .views import EngineerCountView, EngineerListCreateView, EngineerMeView, UploadImageView, EngineerDetailUpdateView
+from .views import EngineerCountView, EngineerStatsView, EngineerExportView, EngineerSearchView, EngineerMatchView, EngineerBatchView, EngineerListCreateView, EngineerMeView, UploadImageView, UploadImageStatusView, EngineerDetailUpdateView
+
+if settings.ASYNC_VIEWS:
+    # Reads served by async views on motor; their writes are handed to the sync views
+    from . import async_views
+    count_view = async_views.engineer_count
+    me_view = async_views.engineer_me
+    detail_view = async_views.engineer_detail
+    list_view = async_views.engineer_list
+else:
+    count_view = EngineerCountView.as_view()
+    me_view = EngineerMeView.as_view()
+    detail_view = EngineerDetailUpdateView.as_view()
+    list_view = EngineerListCreateView.as_view()
 
 urlpatterns = [
-    path('engineers/count/', EngineerCountView.as_view(), name='engineer-count'),
-    path('engineers/me/', EngineerMeView.as_view(), name='engineer-me'),
+    path('engineers/count/', count_view, name='engineer-count'),
+    path('engineers/stats/', EngineerStatsView.as_view(), name='engineer-stats'),
+    path('engineers/export/', EngineerExportView.as_view(), name='engineer-export'),
+    path('engineers/search/', EngineerSearchView.as_view(), name='engineer-search'),
+    path('engineers/match/', EngineerMatchView.as_view(), name='engineer-match'),
+    path('engineers/batch/', EngineerBatchView.as_view(), name='engineer-batch'),
+    path('engineers/me/', me_view, name='engineer-me'),
     path('engineers/upload/', UploadImageView.as_view(), name='upload-image'),
-    path('engineers/<uuid:engineer_id>/', EngineerDetailUpdateView.as_view(), name='engineer-detail-update'),
-    path('engineers/', EngineerListCreateView.as_view(), name='engineers-list-create'),
+    path('engineers/upload/<uuid:job_id>/', UploadImageStatusView.as_view(), name='upload-image-status'),
+    path('engineers/<uuid:engineer_id>/', detail_view, name='engineer-detail-update'),
+    path('engineers/', list_view, name='engineers-list-create'),
 ]
@@ -6,76 +6,270 @@ from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 #Internal imports
 from .models import Engineer
-from .serializers import EngineerSerializer
+from .serializers import EngineerSerializer, EngineerListSerializer, ENGINEER_LIST_FIELDS, profile_data, profiles_data
+from .pagination import encode_cursor, decode_cursor, InvalidCursor, page_params, InvalidPage
+from .filters import engineer_filters, filter_engineers, engineers_by_ids
+from .bitmaps import filter_index
+from .cache import (get_engineer_count, estimated_engineer_count, get_cached_profile, get_cached_profile_for_user,
+                    cache_profile, get_cached_profiles, cache_profiles)
+from .search import search_engineers
+from .stats import get_engineer_stats
+from .http import profile_response
+from django.utils.cache import get_conditional_response
+from .updates import update_engineer, update_precondition, VersionConflict
+from .export import export_record, iter_engineer_documents, ndjson_line, csv_lines
+from .matching import engineer_matrix, parse_match_query
+from django.http import StreamingHttpResponse
 from users.models import User
 from django.utils.decorators import method_decorator
-from engineers.decorators import engineer_required
-# Cloudinary
-from cloudinary.uploader import upload
-# JSON
-from django.http import JsonResponse
-import json
+from engineers.decorators import engineer_required, recruiter_required
+# Uploads
+from .uploads import validate_image, spool_upload, submit_upload, get_upload_job, UploadRejected
+from django.conf import settings
+from mongoengine.errors import ValidationError
+from backend.mongo import list_read_preference
+from backend.parsers import loads
+from django.urls import reverse
+import uuid
+# Logger
+import logging
+
+logger = logging.getLogger(__name__)
+
+def update_engineer_response(request, lookup, not_found):
+    """
+    Validate a partial profile update and apply it atomically to the profile matching `lookup`.
+    Honours If-Match / `version` preconditions with 412 on conflicts.
+    """
+    serializer = EngineerSerializer(data=request.data, partial=True, context={'request': request})
+    if not serializer.is_valid():
+        logger.warning("Profile update rejected: %s", serializer.errors)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        version, etag = update_precondition(request)
+        engineer = update_engineer(lookup, serializer.validated_data, version, etag)
+    except ValidationError as e:
+        errors = {field: [str(error)] for field, error in e.errors.items()}
+        logger.warning("Profile update rejected: %s", errors)
+        return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+    except VersionConflict:
+        return Response({'error': 'Profile was changed by another request, reload it and try again'},
+                        status=status.HTTP_412_PRECONDITION_FAILED)
+    if engineer is None:
+        return Response(not_found, status=status.HTTP_404_NOT_FOUND)
+
+    response = Response(profile_data(engineer), status=status.HTTP_200_OK)
+    response['ETag'] = engineer.etag
+    return response
 
 class EngineerMeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        engineer = Engineer.objects.filter(user=user).first()
-        if engineer:
-            serializer = EngineerSerializer(engineer)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        else:
-            return Response({'detail': 'Engineer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        entry = get_cached_profile_for_user(request.user.id)
+        if entry is None:
+            engineer = Engineer.objects.filter(user=request.user.id).first()
+            if not engineer:
+                return Response({'detail': 'Engineer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+            entry = cache_profile(engineer, profile_data(engineer), user_id=request.user.id)
+        return profile_response(request, entry)
 
     def put(self, request):
-        user = request.user
-        engineer = Engineer.objects.filter(user=user).first()
-        if not engineer:
-            return Response({'detail': 'Engineer profile not found'}, status=status.HTTP_404_NOT_FOUND)
-
-        serializer = EngineerSerializer(engineer, data=request.data, partial=True, context={'request': request})
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        else:
-            print("Serializer errors:", serializer.errors)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return update_engineer_response(request, {'user': request.user.id},
+                                        {'detail': 'Engineer profile not found'})
         
 class EngineerCountView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        count = Engineer.objects.count()
-        return Response({'count': count})
+        count = estimated_engineer_count()
+        etag = f'"engineer-count-{count}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response({'count': count, 'count_is_estimate': True})
+        response['ETag'] = etag
+        return response
+
+class EngineerStatsView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        stats = get_engineer_stats()
+        etag = f'"engineer-stats-{stats["version"]}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            data = {key: value for key, value in stats.items() if key != 'version'}
+            response = Response(data, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={settings.ENGINEER_STATS_CACHE_TIMEOUT}'
+        return response
+
+class EngineerExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @method_decorator(recruiter_required)
+    def get(self, request):
+        # `type` rather than `format`, which DRF reserves for renderer selection
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in ('ndjson', 'csv'):
+            return Response({'error': 'type must be ndjson or csv'}, status=status.HTTP_400_BAD_REQUEST)
+
+        engineers = filter_engineers(engineer_filters(request.query_params))
+        records = (export_record(document)
+                   for document in iter_engineer_documents(engineers, settings.ENGINEER_EXPORT_BATCH_SIZE))
+        if export_type == 'csv':
+            response = StreamingHttpResponse(csv_lines(records), content_type='text/csv; charset=utf-8')
+        else:
+            response = StreamingHttpResponse((ndjson_line(record) for record in records),
+                                             content_type='application/x-ndjson; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="engineers.{export_type}"'
+        return response
+
+class EngineerSearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        filters = engineer_filters(request.query_params)
+        try:
+            page, limit = page_params(request.query_params)
+        except InvalidPage as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        engineers, total, facets = search_engineers(query, filters, (page - 1) * limit, limit)
+        serializer = EngineerListSerializer(engineers, many=True)
+        return Response({
+            'engineers': serializer.data,
+            'total': total,
+            'facets': facets
+        }, status=status.HTTP_200_OK)
+
+class EngineerMatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @method_decorator(recruiter_required)
+    def post(self, request):
+        try:
+            criteria, weights, limit = parse_match_query(request.data)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids, scores, matched, unknown_skills = engineer_matrix.top_matches(criteria, weights, limit)
+
+        # Only the winners are read from MongoDB, in one query, then put back in rank order
+        score_of = dict(zip(ids, scores))
+        engineers = [{**EngineerListSerializer(document).data, 'match_score': round(score_of[document['_id']], 4)}
+                     for document in engineers_by_ids(ids)]
+
+        return Response({
+            'engineers': engineers,
+            'total': matched,
+            'unknown_skills': unknown_skills
+        }, status=status.HTTP_200_OK)
+
+class EngineerBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @method_decorator(recruiter_required)
+    def post(self, request):
+        """
+        Full profiles for {"ids": [...]} in the order asked for, like the detail view
+        would return them one by one. Cached profiles are reused; the rest come
+        from one $in query. Ids without a profile are listed under `missing`.
+        """
+        raw_ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(raw_ids, list) or not raw_ids:
+            return Response({'error': 'ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(raw_ids) > settings.ENGINEER_BATCH_MAX_IDS:
+            return Response({'error': f'At most {settings.ENGINEER_BATCH_MAX_IDS} ids per request'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # Duplicates are answered once, at their first position
+            engineer_ids = list(dict.fromkeys(str(uuid.UUID(str(raw_id))) for raw_id in raw_ids))
+        except ValueError:
+            return Response({'error': 'ids must be UUIDs'}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = get_cached_profiles(engineer_ids)
+        uncached = [engineer_id for engineer_id in engineer_ids if engineer_id not in entries]
+        if uncached:
+            engineers = list(Engineer.objects(id__in=uncached))
+            entries.update(cache_profiles(engineers, profiles_data(engineers)))
+
+        return Response({
+            'engineers': [entries[engineer_id]['data'] for engineer_id in engineer_ids if engineer_id in entries],
+            'missing': [engineer_id for engineer_id in engineer_ids if engineer_id not in entries]
+        }, status=status.HTTP_200_OK)
 
 class EngineerListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     @method_decorator(engineer_required)
     def get(self, request):
-        country = request.query_params.get('country', '')
-        role_type = request.query_params.get('roleType', '')
-        role_level = request.query_params.get('roleLevel', '')
-        page = int(request.query_params.get('page', 1))
-        limit = int(request.query_params.get('limit', 10))
-
-        # Filtering engineers based on query params
-        engineers = Engineer.objects()
-        if country:
-            engineers = engineers.filter(country=country)
-        if role_type:
-            engineers = engineers.filter(role_type=role_type)
-        if role_level:
-            engineers = engineers.filter(role_level=role_level)
-
-        total_engineers = engineers.count()
+        filters = engineer_filters(request.query_params)
+        try:
+            page, limit = page_params(request.query_params)
+        except InvalidPage as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Cursor mode: keyset pagination on _id, so deep pages cost the same as the first one
+        cursor_mode = 'cursor' in request.query_params
+        after_id = None
+        if cursor_mode:
+            try:
+                after_id = decode_cursor(request.query_params['cursor'])
+            except InvalidCursor:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The in-memory filter index answers with exact totals when it is fresh
+        if settings.ENGINEER_FILTER_INDEX:
+            indexed = filter_index.query(filters, offset=(page - 1) * limit, limit=limit,
+                                         after_id=after_id, cursor=cursor_mode)
+            if indexed is not None:
+                serializer = EngineerListSerializer(engineers_by_ids(indexed.ids), many=True)
+                data = {
+                    'engineers': serializer.data,
+                    'total': indexed.total,
+                    'total_is_estimate': False
+                }
+                if cursor_mode:
+                    data['next_cursor'] = encode_cursor(indexed.ids[-1]) if indexed.has_more else None
+                return Response(data, status=status.HTTP_200_OK)
+
+        # Filtering engineers based on query params; list pages may read from secondaries
+        engineers = filter_engineers(filters).read_preference(list_read_preference())
+
+        total_engineers, total_is_estimate = get_engineer_count(filters, engineers)
+
+        # List pages only need card fields, read as raw documents, in the index's _id order
+        engineers = engineers.only(*ENGINEER_LIST_FIELDS).as_pymongo().order_by('id')
+
+        if cursor_mode:
+            if after_id is not None:
+                engineers = engineers.filter(id__gt=after_id)
+
+            # Fetch one extra document to know whether there is a next page
+            page_engineers = list(engineers.limit(limit + 1))
+            next_cursor = None
+            if len(page_engineers) > limit:
+                page_engineers = page_engineers[:limit]
+                next_cursor = encode_cursor(page_engineers[-1]['_id'])
+
+            serializer = EngineerListSerializer(page_engineers, many=True)
+            return Response({
+                'engineers': serializer.data,
+                'total': total_engineers,
+                'total_is_estimate': total_is_estimate,
+                'next_cursor': next_cursor
+            }, status=status.HTTP_200_OK)
+
         engineers = engineers[(page - 1) * limit: page * limit]
 
-        serializer = EngineerSerializer(engineers, many=True)
+        serializer = EngineerListSerializer(engineers, many=True)
         return Response({
             'engineers': serializer.data,
-            'total': total_engineers
+            'total': total_engineers,
+            'total_is_estimate': total_is_estimate
         }, status=status.HTTP_200_OK)
 
     @method_decorator(engineer_required)
@@ -85,21 +279,21 @@ class EngineerListCreateView(APIView):
         # Parse role_type and role_level if they are JSON strings
         if 'role_type' in data and isinstance(data['role_type'], str):
             try:
-                data['role_type'] = json.loads(data['role_type'])
-            except json.JSONDecodeError:
+                data['role_type'] = loads(data['role_type'])
+            except ValueError:
                 pass  # Handle the error as needed
 
         if 'role_level' in data and isinstance(data['role_level'], str):
             try:
-                data['role_level'] = json.loads(data['role_level'])
-            except json.JSONDecodeError:
+                data['role_level'] = loads(data['role_level'])
+            except ValueError:
                 pass  # Handle the error as needed
 
         # Add 'user' to data
         data['user'] = str(request.user.id)  # Associate the engineer profile with the authenticated user
 
         # Log the processed data --> NOT FOR PRODUCTION
-        # print("Processed data:", data)
+        # logger.debug("Processed data: %s", data)
 
         # **Pass the request context to the serializer**
         serializer = EngineerSerializer(data=data, context={'request': request})
@@ -111,7 +305,7 @@ class EngineerListCreateView(APIView):
                 'message': 'Engineer profile created successfully'
             }, status=status.HTTP_201_CREATED)
         else:
-            print("Serializer errors:", serializer.errors)
+            logger.warning("Profile creation rejected: %s", serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -120,26 +314,18 @@ class EngineerDetailUpdateView(APIView):
 
     @method_decorator(engineer_required)
     def get(self, request, engineer_id):
-        try:
-            engineer = Engineer.objects.get(id=engineer_id)
-            serializer = EngineerSerializer(engineer)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Engineer.DoesNotExist:
-            return Response({'error': 'Engineer not found'}, status=status.HTTP_404_NOT_FOUND)
+        entry = get_cached_profile(engineer_id)
+        if entry is None:
+            try:
+                engineer = Engineer.objects.get(id=engineer_id)
+            except Engineer.DoesNotExist:
+                return Response({'error': 'Engineer not found'}, status=status.HTTP_404_NOT_FOUND)
+            entry = cache_profile(engineer, profile_data(engineer))
+        return profile_response(request, entry)
 
     @method_decorator(engineer_required)
     def put(self, request, engineer_id):
-        try:
-            engineer = Engineer.objects.get(id=engineer_id)
-            serializer = EngineerSerializer(engineer, data=request.data, partial=True, context={'request': request})
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            else:
-                print("Serializer errors:", serializer.errors)
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        except Engineer.DoesNotExist:
-            return Response({'error': 'Engineer not found'}, status=status.HTTP_404_NOT_FOUND)
+        return update_engineer_response(request, {'id': engineer_id}, {'error': 'Engineer not found'})
 
 
 class UploadImageView(APIView):
@@ -147,12 +333,41 @@ class UploadImageView(APIView):
     parser_classes = (MultiPartParser, FormParser)
 
     def post(self, request, *args, **kwargs):
+        # Refuse oversized bodies before the multipart data is even read
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        if content_length > settings.AVATAR_MAX_UPLOAD_SIZE + 64 * 1024:
+            return Response({'error': 'File too large'}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
         file = request.data.get('file')
         if not file:
             return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            result = upload(file)
-            return JsonResponse(result, status=200)
-        except Exception as e:
-            return Response({'error': f"Error uploading to Cloudinary: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            validate_image(file)
+        except UploadRejected as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Thumbnailing and the upload to storage run in the background; the client polls the job
+        attach_to_profile = str(request.data.get('attach_to_profile', '')).lower() == 'true'
+        job_id = submit_upload(spool_upload(file), request.user.id, attach_to_profile)
+        return Response({
+            'job_id': job_id,
+            'status': 'pending',
+            'status_url': reverse('upload-image-status', kwargs={'job_id': job_id}),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class UploadImageStatusView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_upload_job(job_id)
+        if not job or job['owner'] != str(request.user.id):
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        data = {'job_id': str(job_id), 'status': job['status']}
+        if 'result' in job:
+            data.update(job['result'])
+        if 'error' in job:
+            data['error'] = job['error']
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,59 @@
+# gunicorn.conf.py
+#
+#   gunicorn -c gunicorn.conf.py
+#
+# Serves backend.wsgi on threaded workers, or backend.asgi on uvicorn workers
+# when ASYNC_VIEWS is on. Every worker opens its own MongoDB connections after
+# fork (post_fork below); pymongo clients must never be shared across a fork.
+
+import multiprocessing
+import os
+import sys
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings_production')
+
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '').lower() in ('1', 'true', 'yes', 'on')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+# Workers share state through the Django cache, which is only shared when
+# REDIS_URL points settings_production at Redis; otherwise run a single worker
+SHARED_CACHE = bool(os.environ.get('REDIS_URL'))
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1 if SHARED_CACHE else 1))
+if workers > 1 and not SHARED_CACHE:
+    raise RuntimeError('GUNICORN_WORKERS > 1 needs REDIS_URL: cached state must be shared between workers')
+
+if ASYNC_VIEWS:
+    wsgi_app = 'backend.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'backend.wsgi:application'
+    worker_class = 'gthread'
+    # Keep MONGO_MAX_POOL_SIZE at or above this
+    threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so slow leaks cannot accumulate
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = 500
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Only with preload_app has Django been set up (and clients registered) in
+    # the parent; otherwise the worker connects when it loads the app.
+    if 'django' in sys.modules:
+        from django.apps import apps
+        if apps.ready:
+            from backend.mongo import reconnect_mongo
+            reconnect_mongo()
+
+
+def post_worker_init(worker):
+    # Each worker runs its own mail dispatcher thread (threads do not survive
+    # the fork); start it now to resend what the previous workers left spooled.
+    from users.mail import start_mail_dispatcher
+    start_mail_dispatcher()
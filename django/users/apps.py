@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        if settings.MONGO_AUTO_CONNECT:
+            from backend.mongo import connect_mongo
+            connect_mongo()
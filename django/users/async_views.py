@@ -0,0 +1,143 @@
+# users/async_views.py
+#
+# Async counterparts of the hot read endpoints, used when ASYNC_VIEWS is on.
+# They are plain Django async views on motor: DRF's APIView is sync-only, so
+# authentication, role checks and method routing are done here by hand.
+
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, HttpResponseNotAllowed
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+
+from backend.mongo import get_async_db
+from backend.parsers import loads
+from .authentication import CustomJWTAuthentication, authenticate_async
+from .cache import user_cache
+from .hashing import password_hasher, PasswordHasherBusy
+from .models import User
+from .serializers import UserSerializer
+from .tokens import tokens_for_user
+
+logger = logging.getLogger(__name__)
+
+
+def async_view(methods, fallback=None):
+    """
+    Serve `methods` from the decorated async view and hand every other method
+    to the sync DRF view `fallback` (or answer 405). Like APIView, the result
+    is exempt from CSRF checks, which are meaningless for token auth.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapped(request, *args, **kwargs):
+            if request.method in methods:
+                return await view(request, *args, **kwargs)
+            if fallback is not None:
+                # Not thread-sensitive: mongoengine is thread-safe and writes
+                # should not queue behind each other on one shared thread
+                return await sync_to_async(fallback, thread_sensitive=False)(request, *args, **kwargs)
+            return HttpResponseNotAllowed(methods)
+        # csrf_exempt() is not async-aware before Django 5.0; set its marker directly
+        wrapped.csrf_exempt = True
+        return wrapped
+    return decorator
+
+
+async def authenticated_user(request, role=None):
+    """
+    Authenticate the request like DRF's IsAuthenticated (plus the *_required
+    role decorators when `role` is given).
+
+    Returns (user, None) on success and (None, error response) otherwise.
+    """
+    try:
+        user = await authenticate_async(request)
+    except AuthenticationFailed as exc:
+        data = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+        response = JsonResponse(data, status=exc.status_code)
+        response['WWW-Authenticate'] = CustomJWTAuthentication().authenticate_header(request)
+        return None, response
+    if user is None:
+        response = JsonResponse({'detail': 'Authentication credentials were not provided.'},
+                                status=status.HTTP_401_UNAUTHORIZED)
+        response['WWW-Authenticate'] = CustomJWTAuthentication().authenticate_header(request)
+        return None, response
+    if role is not None and user.role != role:
+        return None, JsonResponse({'error': f'{role.capitalize()} access required'}, status=status.HTTP_403_FORBIDDEN)
+    request.user = user
+    return user, None
+
+
+def request_data(request):
+    """
+    The request body as a dict, for JSON and form posts.
+    """
+    if request.content_type == 'application/json':
+        try:
+            data = loads(request.body or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+    return request.POST
+
+
+@async_view(['POST'])
+async def login(request):
+    data = request_data(request)
+    email = data.get('email')
+    password = data.get('password')
+
+    logger.debug(f"Login attempt for email: {email}")
+
+    if not email or not password:
+        logger.debug("Email or password not provided")
+        return JsonResponse({'error': 'Please provide both email and password'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        users = get_async_db().users
+        document = await users.find_one({'email': email})
+        user = User._from_son(document) if document else None
+        if user and await password_hasher.acheck(user.password_hash, password):
+            logger.debug(f"Authenticated user: {user.email}")
+        else:
+            logger.debug("Invalid credentials")
+            return JsonResponse({'error': 'Invalid Credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        # Upgrade hashes made with older PASSWORD_HASH_METHOD parameters while we have the password
+        if user.password_needs_rehash():
+            logger.debug(f"Rehashing password for user: {email}")
+            user.password_hash = await password_hasher.ahash(password)
+            await users.update_one({'_id': user.id}, {'$set': {'password_hash': user.password_hash}})
+            user_cache.invalidate(user.id)
+
+        if not user.is_verified:
+            logger.debug(f"User {email} is not verified")
+            return JsonResponse({'error': 'Email not verified'}, status=status.HTTP_403_FORBIDDEN)
+
+        if not user.role:
+            logger.debug(f"User {email} does not have a role set")
+            return JsonResponse({'error': 'User role not set'}, status=status.HTTP_403_FORBIDDEN)
+
+        refresh = tokens_for_user(user)
+        logger.debug(f"Login successful for user: {email}")
+
+        return JsonResponse({
+            'user': UserSerializer(user).data,
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+            'role': user.role,
+            'id': str(user.id)
+        }, status=status.HTTP_200_OK)
+
+    except PasswordHasherBusy:
+        logger.warning("Password hashing pool saturated, rejecting login")
+        response = JsonResponse({'error': 'Too many login attempts in progress, please retry shortly'},
+                                status=status.HTTP_429_TOO_MANY_REQUESTS)
+        response['Retry-After'] = '1'
+        return response
+    except Exception as e:
+        logger.error(f"Error during login: {str(e)}")
+        return JsonResponse({'error': 'An error occurred during login'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
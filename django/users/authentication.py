@@ -1,8 +1,13 @@
 # authentication.py
 
+import uuid
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.settings import api_settings
 from .models import User
+from .cache import user_cache
+from .tokens import TokenPrincipal, TOKEN_VERSION_CLAIM, current_token_version, acurrent_token_version
+from backend.mongo import get_async_db
+from django.conf import settings
 from rest_framework.exceptions import AuthenticationFailed
 
 class CustomJWTAuthentication(JWTAuthentication):
@@ -13,11 +18,62 @@ class CustomJWTAuthentication(JWTAuthentication):
 
             if not user_id:
                 raise AuthenticationFailed('Invalid token: no user ID claim found.')
-                
-            # Make sure user_id is in the correct format (UUID) for MongoDB query
-            user = User.objects.get(id=user_id)
+
+            # Tokens carrying role claims authorize without loading the user,
+            # unless a role change since issuance has bumped the token version
+            if settings.JWT_EMBED_USER_CLAIMS and TOKEN_VERSION_CLAIM in validated_token:
+                if validated_token[TOKEN_VERSION_CLAIM] != current_token_version(user_id):
+                    raise AuthenticationFailed('Token has been revoked.')
+                return TokenPrincipal(validated_token)
+
+            # Served from the process-local cache when possible, so auth costs no round-trip
+            user = user_cache.get(user_id)
+            if user is None:
+                # Make sure user_id is in the correct format (UUID) for MongoDB query
+                user = User.objects.get(id=user_id)
+                user_cache.set(user_id, user)
             return user
+        except AuthenticationFailed:
+            raise
         except User.DoesNotExist:
             raise AuthenticationFailed('User not found.')
         except Exception as e:
             raise AuthenticationFailed(f'Error in authentication: {str(e)}')
+
+
+async def authenticate_async(request):
+    """
+    CustomJWTAuthentication for plain Django async views, loading the user through motor.
+
+    Returns the user (or TokenPrincipal), None when the request carries no
+    token, and raises AuthenticationFailed/InvalidToken like the sync class.
+    """
+    authentication = CustomJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    validated_token = authentication.get_validated_token(raw_token)
+
+    user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+    if not user_id:
+        raise AuthenticationFailed('Invalid token: no user ID claim found.')
+
+    try:
+        if settings.JWT_EMBED_USER_CLAIMS and TOKEN_VERSION_CLAIM in validated_token:
+            if validated_token[TOKEN_VERSION_CLAIM] != await acurrent_token_version(user_id):
+                raise AuthenticationFailed('Token has been revoked.')
+            return TokenPrincipal(validated_token)
+    except User.DoesNotExist:
+        raise AuthenticationFailed('User not found.')
+
+    user = user_cache.get(user_id)
+    if user is None:
+        document = await get_async_db().users.find_one({'_id': uuid.UUID(str(user_id))})
+        if document is None:
+            raise AuthenticationFailed('User not found.')
+        user = User._from_son(document)
+        user_cache.set(user_id, user)
+    return user
@@ -0,0 +1,83 @@
+# users/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+
+
+class UserCache:
+    """
+    Process-local LRU cache of hydrated User documents with a time-to-live.
+
+    Cached users are shared between requests, so callers must not mutate them;
+    User.save() invalidates the entry for the saved user.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = max_size if max_size is not None else getattr(settings, 'USER_CACHE_MAX_SIZE', 1024)
+        self.ttl = ttl if ttl is not None else getattr(settings, 'USER_CACHE_TTL', 60)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, user_id, user):
+        if self.max_size <= 0:
+            return
+        key = str(user_id)
+        with self._lock:
+            self._entries[key] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache()
+
+
+# Current token version per user, consulted when tokens carry role claims.
+# Lives in the shared Django cache so a role change made by one worker revokes
+# stale tokens in the others (with a per-process cache, after USER_CACHE_TTL).
+
+def _token_version_key(user_id):
+    return f'users:token_version:{user_id}'
+
+
+def get_cached_token_version(user_id):
+    return cache.get(_token_version_key(user_id))
+
+
+def set_cached_token_version(user_id, version):
+    cache.set(_token_version_key(user_id), version, getattr(settings, 'USER_CACHE_TTL', 60))
+
+
+async def aget_cached_token_version(user_id):
+    return await cache.aget(_token_version_key(user_id))
+
+
+async def aset_cached_token_version(user_id, version):
+    await cache.aset(_token_version_key(user_id), version, getattr(settings, 'USER_CACHE_TTL', 60))
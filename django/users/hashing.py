@@ -0,0 +1,92 @@
+# users/hashing.py
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHasherBusy(Throttled):
+    default_detail = 'Too many password checks in progress, please retry shortly.'
+
+
+class PasswordHasher:
+    """
+    Runs password hashing on a bounded worker pool.
+
+    At most PASSWORD_HASH_MAX_PENDING hashes run or wait at once; callers beyond
+    that wait up to PASSWORD_HASH_WAIT seconds for a slot and then get
+    PasswordHasherBusy (HTTP 429), so a burst of logins cannot pile up on
+    every request thread.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def _setup(self):
+        """
+        The (executor, slots) pair, created on first use. Always read under the
+        lock, so no caller sees an executor without its semaphore.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+                workers = settings.PASSWORD_HASH_WORKERS
+                if settings.PASSWORD_HASH_EXECUTOR == 'process':
+                    self._executor = ProcessPoolExecutor(max_workers=workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            return self._executor, self._slots
+
+    def _submit(self, func, *args, blocking=True):
+        executor, slots = self._setup()
+        acquired = (slots.acquire(timeout=settings.PASSWORD_HASH_WAIT) if blocking
+                    else slots.acquire(blocking=False))
+        if not acquired:
+            raise PasswordHasherBusy(wait=1)
+        try:
+            future = executor.submit(func, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _run(self, func, *args):
+        return self._submit(func, *args).result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, settings.PASSWORD_HASH_METHOD)
+
+    def check(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    # Async variants for async views: they never block the event loop waiting
+    # for a slot, a saturated pool answers PasswordHasherBusy straight away.
+
+    async def ahash(self, password):
+        future = self._submit(generate_password_hash, password, settings.PASSWORD_HASH_METHOD, blocking=False)
+        return await asyncio.wrap_future(future)
+
+    async def acheck(self, password_hash, password):
+        future = self._submit(check_password_hash, password_hash, password, blocking=False)
+        return await asyncio.wrap_future(future)
+
+    def needs_rehash(self, password_hash):
+        """
+        True when `password_hash` was made with other parameters than PASSWORD_HASH_METHOD.
+        """
+        return password_hash.split('$', 1)[0] != settings.PASSWORD_HASH_METHOD
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
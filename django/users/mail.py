@@ -0,0 +1,226 @@
+# users/mail.py
+
+import logging
+import os
+import pickle
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+logger = logging.getLogger(__name__)
+
+SPOOL_SUFFIX = '.msg'
+# Tells this process's claims apart from those of an earlier process that had
+# the same pid, as after every container restart where the worker is pid 1
+BOOT_ID = uuid.uuid4().hex[:12]
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MailDispatcher:
+    """
+    Sends email from a background thread so requests never wait on SMTP.
+
+    Messages are written to MAIL_SPOOL_DIR before they are queued and removed
+    once sent, so a restart picks up whatever was still pending. The worker
+    keeps one connection to MAIL_QUEUE_BACKEND open across messages, retries
+    failures with exponential backoff and moves messages that keep failing to
+    the spool's `failed/` directory.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._connection = None
+        self._stats = {'sent': 0, 'failed': 0, 'retries': 0}
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+    @property
+    def spool_dir(self):
+        return Path(settings.MAIL_SPOOL_DIR)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            (self.spool_dir / 'failed').mkdir(exist_ok=True)
+            self._recover()
+            self._thread = threading.Thread(target=self._run, name='mail-dispatcher', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, message):
+        self.start()
+        message.connection = None  # connections are not picklable and belong to the worker
+        path = self.spool_dir / f'{time.time_ns()}-{uuid.uuid4().hex}{SPOOL_SUFFIX}'
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as spool_file:
+            pickle.dump(message, spool_file)
+        os.replace(tmp_path, path)
+        self._queue.put(path)
+
+    def _recover(self):
+        """
+        Queue spooled messages left behind by a previous or dead process.
+        """
+        for path in sorted(self.spool_dir.iterdir()):
+            name = path.name
+            if name.endswith(SPOOL_SUFFIX):
+                self._queue.put(path)
+            elif SPOOL_SUFFIX + '.' in name:
+                base, owner = name.rsplit('.', 1)
+                if self._claim_abandoned(path, owner):
+                    try:
+                        os.replace(path, path.with_name(base))
+                    except FileNotFoundError:
+                        continue
+                    self._queue.put(path.with_name(base))
+
+    def _claim_abandoned(self, path, owner):
+        """
+        True when the worker that claimed `path` ("<pid>-<boot id>") can no longer send it:
+        its pid is gone, the pid now belongs to this process under another boot id,
+        or the claim has not been touched for MAIL_CLAIM_TIMEOUT seconds.
+        """
+        pid, _, boot_id = owner.partition('-')
+        if not pid.isdigit():
+            return False
+        if not _pid_alive(int(pid)) or (int(pid) == os.getpid() and boot_id != BOOT_ID):
+            return True
+        try:
+            return time.time() - path.stat().st_mtime > settings.MAIL_CLAIM_TIMEOUT
+        except FileNotFoundError:
+            return False
+
+    def _claim(self, path):
+        claimed = path.with_name(f'{path.name}.{os.getpid()}-{BOOT_ID}')
+        try:
+            os.replace(path, claimed)
+        except FileNotFoundError:
+            return None  # another process is sending it
+        os.utime(claimed)  # claim age counts from now, not from when the message was spooled
+        return claimed
+
+    def _run(self):
+        while True:
+            try:
+                path = self._queue.get(timeout=settings.MAIL_QUEUE_IDLE_TIMEOUT)
+            except queue.Empty:
+                self._close_connection()
+                continue
+            try:
+                claimed = self._claim(path)
+                if claimed is not None:
+                    self._deliver(claimed)
+            except Exception:
+                logger.exception(f"Unexpected error delivering spooled mail {path}")
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, claimed):
+        with open(claimed, 'rb') as spool_file:
+            message = pickle.load(spool_file)
+
+        for attempt in range(settings.MAIL_QUEUE_MAX_RETRIES + 1):
+            if attempt:
+                self._stats['retries'] += 1
+                time.sleep(settings.MAIL_QUEUE_RETRY_BACKOFF * 2 ** (attempt - 1))
+                os.utime(claimed)  # still ours; keep other processes from recovering it
+            started = time.monotonic()
+            try:
+                self._get_connection().send_messages([message])
+            except Exception as e:
+                logger.warning(f"Sending mail to {message.to} failed (attempt {attempt + 1}): {e}")
+                self._close_connection()
+                continue
+            self._record_latency(time.monotonic() - started)
+            self._stats['sent'] += 1
+            os.remove(claimed)
+            return
+
+        self._stats['failed'] += 1
+        logger.error(f"Giving up on mail to {message.to}, kept in {self.spool_dir / 'failed'}")
+        os.replace(claimed, self.spool_dir / 'failed' / claimed.name)
+
+    def _get_connection(self):
+        if self._connection is None:
+            self._connection = get_connection(settings.MAIL_QUEUE_BACKEND, fail_silently=False)
+            self._connection.open()
+        return self._connection
+
+    def _close_connection(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _record_latency(self, seconds):
+        self._latency_last = seconds
+        self._latency_total += seconds
+        self._latency_max = max(self._latency_max, seconds)
+
+    def metrics(self):
+        sent = self._stats['sent']
+        return {
+            'queue_depth': self._queue.qsize(),
+            'sent': sent,
+            'failed': self._stats['failed'],
+            'retries': self._stats['retries'],
+            'send_latency_ms': {
+                'last': round(self._latency_last * 1000, 1),
+                'avg': round(self._latency_total / sent * 1000, 1) if sent else 0.0,
+                'max': round(self._latency_max * 1000, 1),
+            },
+        }
+
+    def flush(self):
+        """
+        Block until every queued message has been handled (for tests and shutdown).
+        """
+        self._queue.join()
+
+
+mail_dispatcher = MailDispatcher()
+
+QUEUED_EMAIL_BACKEND = 'users.mail.QueuedEmailBackend'
+
+
+def start_mail_dispatcher():
+    """
+    Start the dispatcher when EMAIL_BACKEND queues mail, so messages spooled
+    before a restart go out without waiting for the next one to be sent.
+    """
+    if settings.EMAIL_BACKEND == QUEUED_EMAIL_BACKEND:
+        mail_dispatcher.start()
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Email backend that hands messages to the background mail dispatcher.
+
+    Set EMAIL_BACKEND to this class and MAIL_QUEUE_BACKEND to the backend that
+    actually delivers (SMTP in production, locmem or filebased in tests).
+    """
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            mail_dispatcher.enqueue(message)
+        return len(email_messages)
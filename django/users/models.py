@@ -1,5 +1,6 @@
-from mongoengine import Document, EmailField, StringField, BooleanField, UUIDField
-from werkzeug.security import generate_password_hash, check_password_hash
+from mongoengine import Document, EmailField, StringField, BooleanField, UUIDField, IntField
+from .cache import user_cache, set_cached_token_version
+from .hashing import password_hasher
 import uuid
 
 class User(Document):
@@ -9,14 +10,32 @@ class User(Document):
     role = StringField(choices=('engineer', 'recruiter'), null=True)
     is_verified = BooleanField(default=False)
     verification_code = StringField()
+    # Bumped whenever a claim embedded in issued tokens changes, revoking those tokens
+    token_version = IntField(default=0)
 
     meta = {'collection': 'users'}
 
+    # Fields copied into tokens when JWT_EMBED_USER_CLAIMS is on
+    TOKEN_CLAIM_FIELDS = ('role', 'is_verified')
+
+    def save(self, *args, **kwargs):
+        changed = set(self._get_changed_fields())
+        if not self._created and changed.intersection(self.TOKEN_CLAIM_FIELDS):
+            self.token_version = (self.token_version or 0) + 1
+        result = super().save(*args, **kwargs)
+        # Role, verification and password changes must not be served from a stale cached copy
+        user_cache.invalidate(self.id)
+        set_cached_token_version(self.id, self.token_version)
+        return result
+
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.check(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
 
     @property
     def is_authenticated(self):
@@ -4,6 +4,7 @@ from rest_framework import serializers
 from django.core.mail import send_mail
 from django.urls import reverse
 from django.conf import settings
+from backend.instrumentation import TimedSerializerMixin, TimedListSerializer
 import uuid
 
 class RegisterSerializer(DocumentSerializer):
@@ -39,7 +40,8 @@ class RegisterSerializer(DocumentSerializer):
 
 
 
-class UserSerializer(DocumentSerializer):
+class UserSerializer(TimedSerializerMixin, DocumentSerializer):
     class Meta:
         model = User
         fields = ['email', 'is_verified', 'role', 'id']
+        list_serializer_class = TimedListSerializer
@@ -1,8 +1,34 @@
 # backend/users/tests.py
 
-from django.test import TestCase, Client
+from django.test import TestCase, SimpleTestCase, Client, override_settings
 from django.urls import reverse
 from users.models import User
+from users.cache import UserCache, user_cache
+from users.tokens import tokens_for_user, TokenPrincipal
+from users.authentication import CustomJWTAuthentication
+from users.hashing import PasswordHasher, PasswordHasherBusy
+from users.mail import MailDispatcher, start_mail_dispatcher
+from users.async_views import async_view, authenticated_user
+from django.http import HttpResponse
+from django.utils.translation import gettext_lazy
+from django.test import RequestFactory
+from backend.instrumentation import collect_timings, timed
+from backend.parsers import FastJSONParser
+from backend.renderers import FastJSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from django.core import mail
+from django.core.mail import EmailMessage
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from rest_framework.exceptions import AuthenticationFailed
 from unittest.mock import patch
 import uuid
 
@@ -104,3 +130,305 @@ class RegistrationViewTest(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertIn('error', response.json())
         self.assertEqual(response.json()['error'], 'Role is required')
+
+class UserCacheTest(SimpleTestCase):
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entry is evicted once the cache is full.
+        """
+        cache = UserCache(max_size=2, ttl=60)
+        cache.set('a', 'user-a')
+        cache.set('b', 'user-b')
+        cache.get('a')
+        cache.set('c', 'user-c')
+        self.assertEqual(cache.get('a'), 'user-a')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entries_are_dropped(self):
+        """
+        Test that entries are not served past their time-to-live.
+        """
+        cache = UserCache(max_size=2, ttl=0)
+        cache.set('a', 'user-a')
+        self.assertIsNone(cache.get('a'))
+
+class UserCacheInvalidationTest(TestCase):
+    def tearDown(self):
+        user_cache.clear()
+        User.drop_collection()
+
+    def test_save_invalidates_cached_user(self):
+        """
+        Test that saving a user (e.g. a role change) evicts its cached copy.
+        """
+        user = User(email=f'cached_{uuid.uuid4()}@example.com', role='engineer')
+        user.set_password('securepassword123')
+        user.save()
+        user_cache.set(user.id, user)
+
+        user.role = 'recruiter'
+        user.save()
+        self.assertIsNone(user_cache.get(user.id))
+
+@override_settings(JWT_EMBED_USER_CLAIMS=True)
+class TokenClaimsTest(TestCase):
+    def setUp(self):
+        self.user = User(email=f'claims_{uuid.uuid4()}@example.com', role='engineer', is_verified=True)
+        self.user.set_password('securepassword123')
+        self.user.save()
+
+    def tearDown(self):
+        user_cache.clear()
+        User.drop_collection()
+
+    def authenticate(self, token):
+        auth = CustomJWTAuthentication()
+        return auth.get_user(auth.get_validated_token(str(token)))
+
+    def test_claims_authorize_without_user_document(self):
+        """
+        Test that a token with embedded claims yields a principal carrying the role.
+        """
+        principal = self.authenticate(tokens_for_user(self.user).access_token)
+        self.assertIsInstance(principal, TokenPrincipal)
+        self.assertEqual(principal.id, self.user.id)
+        self.assertEqual(principal.role, 'engineer')
+        self.assertTrue(principal.is_verified)
+
+    def test_role_change_revokes_issued_tokens(self):
+        """
+        Test that changing the role invalidates tokens carrying the old role.
+        """
+        access = tokens_for_user(self.user).access_token
+        self.user.role = 'recruiter'
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(access)
+        principal = self.authenticate(tokens_for_user(self.user).access_token)
+        self.assertEqual(principal.role, 'recruiter')
+
+class PasswordHasherTest(SimpleTestCase):
+    @override_settings(PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    def test_needs_rehash_on_parameter_change(self):
+        """
+        Test that hashes made with other parameters are flagged for rehashing.
+        """
+        hasher = PasswordHasher()
+        password_hash = hasher.hash('securepassword123')
+        self.assertFalse(hasher.needs_rehash(password_hash))
+        with self.settings(PASSWORD_HASH_METHOD='pbkdf2:sha256:2000'):
+            self.assertTrue(hasher.needs_rehash(password_hash))
+        self.assertTrue(hasher.check(password_hash, 'securepassword123'))
+        hasher.shutdown()
+
+    @override_settings(PASSWORD_HASH_MAX_PENDING=1, PASSWORD_HASH_WAIT=0.01)
+    def test_saturated_pool_rejects(self):
+        """
+        Test that callers are turned away once every slot is taken.
+        """
+        hasher = PasswordHasher()
+        _, slots = hasher._setup()
+        slots.acquire()
+        with self.assertRaises(PasswordHasherBusy):
+            hasher.hash('securepassword123')
+        slots.release()
+        hasher.shutdown()
+
+    @override_settings(PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    def test_concurrent_first_use(self):
+        """
+        Test that threads racing to the first hash all get a fully set up pool.
+        """
+        hasher = PasswordHasher()
+        barrier = threading.Barrier(8)
+
+        def first_hash():
+            barrier.wait()
+            return hasher.hash('securepassword123')
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            hashes = list(pool.map(lambda _: first_hash(), range(8)))
+        self.assertTrue(all(hasher.check(password_hash, 'securepassword123') for password_hash in hashes))
+        hasher.shutdown()
+
+class AsyncViewsTest(SimpleTestCase):
+    async def test_async_check_rejects_when_saturated(self):
+        """
+        Test that async password checks fail fast instead of waiting for a slot.
+        """
+        hasher = PasswordHasher()
+        password_hash = hasher.hash('securepassword123')
+        self.assertTrue(await hasher.acheck(password_hash, 'securepassword123'))
+        for _ in range(hasher._slots._initial_value):
+            hasher._slots.acquire()
+        with self.assertRaises(PasswordHasherBusy):
+            await hasher.acheck(password_hash, 'securepassword123')
+        hasher.shutdown()
+
+    async def test_unhandled_methods_fall_back(self):
+        """
+        Test that methods the async view does not serve go to the sync view, or get 405.
+        """
+        async def read(request):
+            return HttpResponse('async')
+
+        routed = async_view(['GET'], fallback=lambda request: HttpResponse('sync'))(read)
+        factory = RequestFactory()
+        self.assertEqual((await routed(factory.get('/'))).content, b'async')
+        self.assertEqual((await routed(factory.post('/'))).content, b'sync')
+        self.assertEqual((await async_view(['GET'])(read)(factory.post('/'))).status_code, 405)
+        self.assertTrue(routed.csrf_exempt)
+
+    async def test_missing_token_is_unauthorized(self):
+        """
+        Test that async views answer 401 without credentials, like IsAuthenticated.
+        """
+        user, response = await authenticated_user(RequestFactory().get('/'))
+        self.assertIsNone(user)
+        self.assertEqual(response.status_code, 401)
+
+class HealthCheckTest(SimpleTestCase):
+    def test_healthz(self):
+        """
+        Test that the liveness probe answers without touching MongoDB.
+        """
+        response = self.client.get(reverse('healthz'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ok')
+
+    def test_readyz_reports_exhausted_pool(self):
+        """
+        Test that readiness fails while every pooled connection is checked out.
+        """
+        snapshot = {'max_pool_size': 2, 'clients': 1,
+                    'servers': {'localhost:27017': {'open': 2, 'checked_out': 2, 'checkout_failures': 0, 'cleared': 0}}}
+        with patch('backend.health.pool_monitor.snapshot', return_value=snapshot), \
+                patch('backend.health.get_db'):
+            response = self.client.get(reverse('readyz'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['pool_exhausted'], ['localhost:27017'])
+
+    @override_settings(EMAIL_BACKEND='users.mail.QueuedEmailBackend')
+    def test_readyz_reports_mail_queue(self):
+        """
+        Test that readiness reports the mail dispatcher's counters when mail is queued.
+        """
+        with patch('backend.health.get_db'):
+            response = self.client.get(reverse('readyz'))
+        self.assertEqual(response.status_code, 200)
+        mail_metrics = response.json()['checks']['mail']
+        self.assertEqual(set(mail_metrics), {'queue_depth', 'sent', 'failed', 'retries', 'send_latency_ms'})
+
+class RequestInstrumentationTest(SimpleTestCase):
+    def test_server_timing_header(self):
+        """
+        Test that responses carry app and db timings in a Server-Timing header.
+        """
+        response = self.client.get(reverse('healthz'))
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[0-9.]+, db;dur=[0-9.]+;desc="0 commands"')
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_server_timing_header_can_be_disabled(self):
+        """
+        Test that the header is left out when SERVER_TIMING_HEADER is off.
+        """
+        self.assertNotIn('Server-Timing', self.client.get(reverse('healthz')))
+
+    def test_timed_sections_accumulate(self):
+        """
+        Test that timed() adds up per name and is a no-op outside a request.
+        """
+        with timed('serialize'):
+            pass
+        with collect_timings() as timings:
+            with timed('serialize'):
+                pass
+            with timed('serialize'):
+                pass
+        self.assertEqual(list(timings.durations), ['serialize'])
+        self.assertGreaterEqual(timings.durations['serialize'], 0)
+
+class FastJSONTest(SimpleTestCase):
+    def test_renderer_matches_drf_output(self):
+        """
+        Test that the fast renderer encodes UUIDs, lazy strings and nested data like JSONRenderer.
+        """
+        data = {'id': uuid.uuid4(), 'detail': gettext_lazy('Not found.'), 'engineers': [{'city': 'Kraków'}],
+                'total': 3, 'total_is_estimate': False}
+        fast = FastJSONRenderer().render(data)
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(data)))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parser_rejects_malformed_json(self):
+        """
+        Test that the fast parser decodes UTF-8 bodies and answers bad ones with ParseError.
+        """
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"city": "Kraków"}'.encode())), {'city': 'Kraków'})
+        for body in (b'{"city": ', b'{"total": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+class MailDispatcherTest(SimpleTestCase):
+    def setUp(self):
+        self.spool = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool, ignore_errors=True)
+        self.override = self.settings(
+            MAIL_SPOOL_DIR=self.spool,
+            MAIL_QUEUE_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        )
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+
+    def test_queued_mail_is_sent_and_unspooled(self):
+        """
+        Test that queued mail goes out through the delivery backend and leaves the spool.
+        """
+        dispatcher = MailDispatcher()
+        dispatcher.enqueue(EmailMessage('Verify your email address', 'body', 'from@example.com', ['to@example.com']))
+        dispatcher.flush()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['to@example.com'])
+        self.assertEqual(os.listdir(self.spool), ['failed'])
+        self.assertEqual(dispatcher.metrics()['sent'], 1)
+
+    def spool_claimed(self, owner, age=0):
+        path = os.path.join(self.spool, f'{time.time_ns()}-{uuid.uuid4().hex}.msg.{owner}')
+        with open(path, 'wb') as spool_file:
+            pickle.dump(EmailMessage('Verify your email address', 'body', 'from@example.com', [f'{owner}@example.com']),
+                        spool_file)
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    @override_settings(MAIL_CLAIM_TIMEOUT=600)
+    def test_restart_recovers_claims_of_an_earlier_boot(self):
+        """
+        Test that claims left by a crashed process are resent even when its pid is alive again.
+        """
+        self.spool_claimed(f'{os.getpid()}-0ldb00t')  # same pid as this process, earlier boot
+        self.spool_claimed(f'{os.getppid()}-0th3r', age=3600)  # live pid, claim long abandoned
+        live = self.spool_claimed(f'{os.getppid()}-0th3r')  # live pid, fresh claim
+        dispatcher = MailDispatcher()
+        dispatcher.start()
+        dispatcher.flush()
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox),
+                         sorted([f'{os.getpid()}-0ldb00t@example.com', f'{os.getppid()}-0th3r@example.com']))
+        self.assertTrue(os.path.exists(live))
+
+    def test_boot_sends_spooled_mail(self):
+        """
+        Test that a fresh process sends what an earlier one left spooled, without a new enqueue.
+        """
+        with open(os.path.join(self.spool, f'{time.time_ns()}-{uuid.uuid4().hex}.msg'), 'wb') as spool_file:
+            pickle.dump(EmailMessage('Verify your email address', 'body', 'from@example.com', ['to@example.com']),
+                        spool_file)
+        dispatcher = MailDispatcher()
+        with patch('users.mail.mail_dispatcher', dispatcher), \
+                override_settings(EMAIL_BACKEND='users.mail.QueuedEmailBackend'):
+            start_mail_dispatcher()
+        dispatcher.flush()
+        self.assertEqual([message.to for message in mail.outbox], [['to@example.com']])
+        self.assertEqual(os.listdir(self.spool), ['failed'])
@@ -0,0 +1,96 @@
+# users/tokens.py
+
+import uuid
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from backend.mongo import get_async_db
+from .models import User
+from .cache import (user_cache, get_cached_token_version, set_cached_token_version,
+                    aget_cached_token_version, aset_cached_token_version)
+
+TOKEN_VERSION_CLAIM = 'ver'
+
+
+def tokens_for_user(user):
+    """
+    Issue a refresh token (and, through it, an access token) for `user`.
+
+    With JWT_EMBED_USER_CLAIMS on, the role and verification status travel in
+    the token so role-gated endpoints can authorize without loading the user.
+    """
+    refresh = RefreshToken.for_user(user)
+    if settings.JWT_EMBED_USER_CLAIMS:
+        for field in User.TOKEN_CLAIM_FIELDS:
+            refresh[field] = getattr(user, field)
+        refresh[TOKEN_VERSION_CLAIM] = user.token_version or 0
+    return refresh
+
+
+def current_token_version(user_id):
+    """
+    The token version tokens for `user_id` must carry to be accepted.
+    """
+    version = get_cached_token_version(user_id)
+    if version is None:
+        user = user_cache.get(user_id)
+        if user is None:
+            user = User.objects(id=user_id).only('token_version').first()
+        if user is None:
+            raise User.DoesNotExist
+        version = user.token_version or 0
+        set_cached_token_version(user_id, version)
+    return version
+
+
+async def acurrent_token_version(user_id):
+    """
+    current_token_version() for async views, loading the version through motor.
+    """
+    version = await aget_cached_token_version(user_id)
+    if version is None:
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await get_async_db().users.find_one({'_id': uuid.UUID(str(user_id))}, {'token_version': 1})
+            if user is None:
+                raise User.DoesNotExist
+            version = user.get('token_version') or 0
+        else:
+            version = user.token_version or 0
+        await aset_cached_token_version(user_id, version)
+    return version
+
+
+class TokenPrincipal:
+    """
+    Authenticated user built only from a validated token's claims.
+
+    Exposes what request handlers read from request.user (id, role, is_verified);
+    call resolve_user() when the full User document is needed.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, validated_token):
+        self.id = uuid.UUID(str(validated_token[api_settings.USER_ID_CLAIM]))
+        self.pk = self.id
+        self.role = validated_token.get('role')
+        self.is_verified = validated_token.get('is_verified', False)
+        self.token_version = validated_token.get(TOKEN_VERSION_CLAIM)
+
+    def __str__(self):
+        return str(self.id)
+
+
+def resolve_user(user):
+    """
+    Return the User document behind request.user, loading it for a TokenPrincipal.
+    """
+    if isinstance(user, User):
+        return user
+    document = user_cache.get(user.id)
+    if document is None:
+        document = User.objects.get(id=user.id)
+        user_cache.set(user.id, document)
+    return document
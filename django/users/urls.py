@@ -1,10 +1,16 @@
 from django.urls import path
 from .views import RegisterView, ProfileView, verify_email, LoginView
 from rest_framework_simplejwt.views import TokenRefreshView
+from django.conf import settings
+
+if settings.ASYNC_VIEWS:
+    from .async_views import login as login_view
+else:
+    login_view = LoginView.as_view()
 
 urlpatterns = [
     path('sign-up/', RegisterView.as_view(), name='register'),  
-    path('login/', LoginView.as_view(), name='login'), 
+    path('login/', login_view, name='login'), 
     # path('login/', TokenObtainPairView.as_view(), name='login'),  # Uncomment this if you want to use Simple JWT's view instead
     path('me/', ProfileView.as_view(), name='profile'),  
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
@@ -7,11 +7,12 @@ from rest_framework_mongoengine.generics import CreateAPIView, RetrieveAPIView
 from rest_framework import permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.decorators import api_view, permission_classes
 # Internal Imports
 from .models import User
 from .serializers import RegisterSerializer, UserSerializer
+from .tokens import tokens_for_user, resolve_user
+from .hashing import PasswordHasherBusy
 from django.views.decorators.csrf import csrf_exempt
 # Logger
 import logging
@@ -45,7 +46,7 @@ class RegisterView(CreateAPIView):
         logger.debug(f"User role after saving: {user.role}")
 
         # Generate tokens for the user
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
 
         # Return response with role information
         return Response({
@@ -69,8 +70,7 @@ class ProfileView(RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        user = self.request.user
-        return user  
+        return resolve_user(self.request.user)
 
 
 @api_view(['GET'])
@@ -116,6 +116,12 @@ class LoginView(APIView):
                 logger.debug("Invalid credentials")
                 return Response({'error': 'Invalid Credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
+            # Upgrade hashes made with older PASSWORD_HASH_METHOD parameters while we have the password
+            if user.password_needs_rehash():
+                logger.debug(f"Rehashing password for user: {email}")
+                user.set_password(password)
+                user.save()
+
             if not user.is_verified:
                 logger.debug(f"User {email} is not verified")
                 return Response({'error': 'Email not verified'}, status=status.HTTP_403_FORBIDDEN)
@@ -124,7 +130,7 @@ class LoginView(APIView):
                 logger.debug(f"User {email} does not have a role set")
                 return Response({'error': 'User role not set'}, status=status.HTTP_403_FORBIDDEN)
 
-            refresh = RefreshToken.for_user(user)
+            refresh = tokens_for_user(user)
             logger.debug(f"Login successful for user: {email}")
 
             return Response({
@@ -135,6 +141,10 @@ class LoginView(APIView):
                 'id': str(user.id)  
             }, status=status.HTTP_200_OK)
 
+        except PasswordHasherBusy:
+            logger.warning("Password hashing pool saturated, rejecting login")
+            return Response({'error': 'Too many login attempts in progress, please retry shortly'},
+                            status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': '1'})
         except Exception as e:
             logger.error(f"Error during login: {str(e)}")
             return Response({'error': 'An error occurred during login'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)